@@ -23,7 +23,7 @@ class ModelPricing:
 class BudgetTracker:
     """Tracks AI usage and costs across all agents"""
 
-    def __init__(self):
+    def __init__(self, project_id: Optional[str] = None):
         # For now, use in-memory tracking. In production, use Redis/Dragonfly
         self._costs: Dict[str, float] = {}
         self._hourly_costs: Dict[str, float] = {}
@@ -32,7 +32,7 @@ class BudgetTracker:
         self.max_cost_per_project = float(os.getenv("BUDGET_MAX_COST_PER_PROJECT", 100.0))
         self.max_cost_per_hour = float(os.getenv("BUDGET_MAX_COST_PER_HOUR", 10.0))
         self.alert_threshold = float(os.getenv("BUDGET_ALERT_THRESHOLD", 0.8))
-        self.project_id = os.getenv("PROJECT_ID", "default-project")
+        self.project_id = project_id or os.getenv("PROJECT_ID", "default-project")
 
         self.job_db = None
         db_path = os.getenv("JOB_DB_PATH")
@@ -202,8 +202,8 @@ class BudgetTracker:
 class EnhancedBudgetTracker(BudgetTracker):
     """Enhanced budget tracker with additional features"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, project_id: Optional[str] = None):
+        super().__init__(project_id)
         self._circuit_breaker_enabled = True
         self._circuit_breaker_threshold = 0.95  # 95% of budget
     
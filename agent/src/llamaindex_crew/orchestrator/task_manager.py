@@ -1192,6 +1192,26 @@ class TaskManager:
         conn.close()
         return tasks
 
+    def get_phase_counts(self) -> Dict[str, Dict[str, int]]:
+        """Return ``{phase: {total, completed, in_progress}}`` in one grouped query"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT phase,
+                   COUNT(*),
+                   SUM(status = ?),
+                   SUM(status = ?)
+            FROM tasks
+            WHERE project_id = ?
+            GROUP BY phase
+        """, (TaskStatus.COMPLETED.value, TaskStatus.IN_PROGRESS.value, self.project_id))
+        counts = {
+            phase: {'total': total, 'completed': completed, 'in_progress': in_progress}
+            for phase, total, completed, in_progress in cursor.fetchall()
+        }
+        conn.close()
+        return counts
+
     def _get_tasks_by_status(self, status: TaskStatus) -> List[TaskDefinition]:
         """Get tasks by status"""
         conn = sqlite3.connect(self.db_path)
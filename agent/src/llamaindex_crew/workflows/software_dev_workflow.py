@@ -97,6 +97,10 @@ def _load_workspace_stack_manifest(workspace_path: Optional[Path]):
 PHASE_RETRY_ATTEMPTS = 3
 PHASE_RETRY_DELAY_SEC = 10
 
+
+class WorkflowCancelled(Exception):
+    """Raised by a progress callback to stop the workflow once its job is cancelled."""
+
 # Ordered phases for resume-from-checkpoint (first phase that runs is at this index)
 _RESUMABLE_PHASES = [
     ProjectState.META,
@@ -419,7 +423,7 @@ class SoftwareDevWorkflow:
             project_id,
             workspace_path=workspace_path
         )
-        self.budget_tracker = EnhancedBudgetTracker()
+        self.budget_tracker = EnhancedBudgetTracker(project_id)
         pl = getattr(config, "prompt_limits", None) if config else None
         self.document_indexer = DocumentIndexer(
             workspace_path,
@@ -454,6 +458,8 @@ class SoftwareDevWorkflow:
         if self.progress_callback:
             try:
                 self.progress_callback(phase, progress, message)
+            except WorkflowCancelled:
+                raise
             except Exception as e:
                 logger.warning(f"Progress callback failed: {e}")
 
@@ -3556,6 +3562,8 @@ class SoftwareDevWorkflow:
                     )
                     contract_result = future.result(timeout=_CONTRACT_TIMEOUT_SECS)
                 break  # success
+            except WorkflowCancelled:
+                raise
             except concurrent.futures.TimeoutError:
                 logger.warning(
                     "⚠️ API contract generation timed out after %ds (attempt %d/%d)",
@@ -3980,6 +3988,8 @@ class SoftwareDevWorkflow:
 
         count_lock = _threading.Lock()
         total = [0]
+        # Set once any worker sees the job cancelled, so the others stop claiming tasks.
+        cancelled = _threading.Event()
 
         logger.info(
             "[%s] ⚡ Parallel file generation: %d workers for %d tasks",
@@ -3997,7 +4007,7 @@ class SoftwareDevWorkflow:
             local_count = 0
             stall = 0
 
-            while True:
+            while not cancelled.is_set():
                 task = self.task_manager.get_and_claim_actionable_task(
                     "development", task_id_filter=task_id_set,
                 )
@@ -4031,6 +4041,9 @@ class SoftwareDevWorkflow:
             for fut in _cf.as_completed(futures):
                 try:
                     fut.result()
+                except WorkflowCancelled:
+                    cancelled.set()
+                    raise
                 except Exception as exc:
                     logger.error("[%s] Parallel worker raised: %s", label, exc)
 
@@ -5455,6 +5468,8 @@ class SoftwareDevWorkflow:
                 future.result(timeout=_DEVOPS_TIMEOUT_SECS)
             logger.info("✅ DevOps phase completed")
             self._report_progress('devops', 95, "Containerfiles and pipelines created")
+        except WorkflowCancelled:
+            raise
         except concurrent.futures.TimeoutError:
             logger.warning("⚠️ DevOps phase timed out after %ds — continuing", _DEVOPS_TIMEOUT_SECS)
             self._report_progress('devops', 95, "DevOps phase timed out — continuing")
@@ -5738,6 +5753,8 @@ markdown content here
         for attempt in range(PHASE_RETRY_ATTEMPTS):
             try:
                 return phase_fn()
+            except WorkflowCancelled:
+                raise
             except Exception as e:
                 last_error = e
                 if _is_transient_llm_error(e) and attempt < PHASE_RETRY_ATTEMPTS - 1:
@@ -5950,6 +5967,10 @@ markdown content here
                 "validation_report": getattr(self, '_validation_report', {}),
                 "state": self.state_machine.get_current_state().value
             }
+        except WorkflowCancelled:
+            # Leave the state machine on the phase that was running so a
+            # resume picks up from that checkpoint rather than from FAILED.
+            raise
         except Exception as e:
             logger.error(f"❌ Workflow failed: {e}")
             self.state_machine.transition(
@@ -564,6 +564,30 @@ class TestEdgeCases:
         finally:
             path.unlink()
 
+    def test_leading_whitespace_is_accepted(self):
+        """Whitespace before the top-level array does not hide it."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            f.write("\n" * 200)
+            json.dump([{"applicationId": "", "issues": {}}], f)
+            path = Path(f.name)
+
+        try:
+            assert is_mta_issues_json(path)
+        finally:
+            path.unlink()
+
+    def test_non_array_raises_error(self):
+        """A top-level object is rejected, not silently parsed as empty."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump({"applicationId": "", "issues": {}}, f)
+            path = Path(f.name)
+        
+        try:
+            with pytest.raises(ValueError):
+                parse_mta_issues_json(path)
+        finally:
+            path.unlink()
+
 
 # ── Test: Output Contract ────────────────────────────────────────────────────
 
@@ -45,6 +45,25 @@ class TestTaskManagerUnit(unittest.TestCase):
         status = self.manager.get_task_status("file_calculator_py")
         self.assertEqual(status.value, "completed")
 
+    def test_get_phase_counts(self):
+        """Phase counts come back grouped, scoped to the project"""
+        for i, status in enumerate(["completed", "in_progress", "registered"]):
+            self.manager.register_task(TaskDefinition(
+                task_id=f"dev_{i}", phase="dev", task_type="file_creation", description="d",
+            ))
+            self.manager.update_task_status(f"dev_{i}", status)
+        self.manager.register_task(TaskDefinition(
+            task_id="qa_0", phase="qa", task_type="test", description="q",
+        ))
+        TaskManager(self.db_path, "other_proj").register_task(TaskDefinition(
+            task_id="other_0", phase="dev", task_type="file_creation", description="o",
+        ))
+
+        self.assertEqual(self.manager.get_phase_counts(), {
+            "dev": {"total": 3, "completed": 1, "in_progress": 1},
+            "qa": {"total": 1, "completed": 0, "in_progress": 0},
+        })
+
 class TestBuildFilePrompt(unittest.TestCase):
     """build_file_prompt must NEVER produce 'unknown' as the target filename."""
 
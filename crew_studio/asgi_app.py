@@ -28,6 +28,8 @@ from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
 
 from crew_studio.job_database import JobDatabase
+from crew_studio.http_cache import etag_matches, job_state_etag
+from crew_studio.bounded_cache import BoundedCache
 from crew_studio.auth import get_current_user, CurrentUser, decode_and_verify_token
 
 logger = logging.getLogger(__name__)
@@ -38,7 +40,7 @@ logger = logging.getLogger(__name__)
 db_path = Path(os.getenv("JOB_DB_PATH", "./crew_jobs.db"))
 job_db = JobDatabase(db_path)
 
-base_workspace_path = Path(os.getenv("WORKSPACE_PATH", "./workspace"))
+base_workspace_path = Path(os.getenv("WORKSPACE_PATH", "./workspace")).resolve()
 base_workspace_path.mkdir(parents=True, exist_ok=True)
 
 # ---------------------------------------------------------------------------
@@ -564,8 +566,8 @@ async def get_job(job_id: str, user: CurrentUser = Depends(get_current_user)):
 
 
 @app.get("/api/jobs/{job_id}/progress")
-async def get_job_progress(job_id: str, user: CurrentUser = Depends(get_current_user)):
-    job = job_db.get_job(job_id)
+async def get_job_progress(job_id: str, request: Request, user: CurrentUser = Depends(get_current_user)):
+    job = job_db.get_job_progress(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -577,18 +579,18 @@ async def get_job_progress(job_id: str, user: CurrentUser = Depends(get_current_
         if not has_access:
             raise HTTPException(status_code=404, detail="Job not found")
 
-    last_messages = job.get("last_message", [])
-    if isinstance(last_messages, str):
-        try:
-            last_messages = json.loads(last_messages)
-        except (json.JSONDecodeError, TypeError):
-            last_messages = []
-    return {
+    # Dashboards poll this every few seconds; unchanged state costs a 304
+    tag = job_state_etag(job)
+    etag = f'"{tag}"'
+    if etag_matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return JSONResponse({
         "status": job["status"],
         "progress": job["progress"],
         "current_phase": job["current_phase"],
-        "last_message": last_messages[-10:],
-    }
+        "last_message": job["last_message"],
+    }, headers={"ETag": etag})
 
 
 @app.post("/api/jobs/{job_id}/approve")
@@ -1043,9 +1045,24 @@ async def push_job_to_git_api(
     return {"status": "pushed", "repo_url": repo_url}
 
 
+# Dashboards poll /api/stats every few seconds per viewer and the aggregate
+# scans every job (plus its llm_usage rows), so each access scope reuses its
+# last result for STATS_TTL seconds.
+STATS_TTL = float(os.getenv("STATS_TTL", "2"))
+_stats_cache = BoundedCache(maxsize=1024, ttl=STATS_TTL)
+
+
 @app.get("/api/stats")
 async def stats(user: CurrentUser = Depends(get_current_user)):
-    return job_db.get_stats(owner_id=user.user_id, team_ids=user.teams, is_admin=user.is_admin)
+    scope = (user.user_id, tuple(user.teams or ()), user.is_admin)
+    cached = _stats_cache.get(scope)
+    if cached is not None:
+        return cached
+    result = await asyncio.to_thread(
+        job_db.get_stats, owner_id=user.user_id, team_ids=user.teams, is_admin=user.is_admin,
+    )
+    _stats_cache.set(scope, result)
+    return result
 
 
 # ---------------------------------------------------------------------------
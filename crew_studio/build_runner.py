@@ -6,7 +6,6 @@ Used by:
 - refactor blueprint (after refactor success, run build on refactored/)
 No duplication of workflow creation or run logic.
 """
-import os
 import traceback
 from datetime import datetime
 from pathlib import Path
@@ -14,6 +13,9 @@ from typing import Any, Callable, Dict, Optional
 
 from src.llamaindex_crew.config import SecretConfig
 
+# Separator line around entries in crew_errors.log / execution.log
+_BANNER = "=" * 80
+
 
 def run_build_pipeline(
     job_id: str,
@@ -33,7 +35,7 @@ def run_build_pipeline(
     When *retry_failed* is True, only incomplete file/feature tasks are retried
     (no meta/PO/architect). *resume* is ignored in that mode.
     """
-    from src.llamaindex_crew.workflows.software_dev_workflow import SoftwareDevWorkflow
+    from src.llamaindex_crew.workflows.software_dev_workflow import SoftwareDevWorkflow, WorkflowCancelled
     from src.llamaindex_crew.tools.file_tools import set_thread_workspace, clear_thread_workspace
 
     # Ensure workspace exists (e.g. may have been deleted; resume or retry can pass stale path)
@@ -59,13 +61,10 @@ def run_build_pipeline(
     clean_logger = CleanJobLogger(str(execution_log_path))
     Settings.callback_manager = CallbackManager([clean_logger])
 
-    # Thread-local: each job thread sees its own workspace path in file tools
+    # Thread-local: each job thread sees its own workspace path in file tools.
+    # The process env is left alone so concurrent jobs never see each other's
+    # workspace; the workflow receives workspace_path/project_id explicitly.
     set_thread_workspace(str(workspace_path))
-    # Also set env var for code that reads os.getenv("WORKSPACE_PATH") directly
-    # (e.g. meta_agent.py). Thread-local takes precedence in file_tools.
-    original_workspace = os.environ.get("WORKSPACE_PATH")
-    os.environ["WORKSPACE_PATH"] = str(workspace_path)
-    os.environ["PROJECT_ID"] = job_id
 
     # Verify file tools will resolve to this workspace (sanity check)
     try:
@@ -80,27 +79,37 @@ def run_build_pipeline(
     except Exception:
         pass
 
+    # One append handle for the whole run instead of an open/close per entry
+    try:
+        error_log = open(error_log_path, "a")
+    except OSError:
+        error_log = None
+
     def _append_log(*lines: str) -> None:
+        if error_log is None:
+            return
         try:
-            with open(error_log_path, "a") as f:
-                f.write("\n".join(lines) + "\n")
+            error_log.write("\n".join(lines) + "\n")
+            error_log.flush()
         except OSError:
             pass  # do not mask original error if log file is missing/unwritable
 
     try:
+        # One timestamp per event, shared by both logs
+        started_at = datetime.now().isoformat()
         _append_log(
-            f"\n{'='*80}",
-            f"JOB STARTED - {datetime.now().isoformat()}",
+            f"\n{_BANNER}",
+            f"JOB STARTED - {started_at}",
             f"Vision: {vision[:2000]}{'...' if len(vision) > 2000 else ''}",
-            f"{'='*80}\n",
+            f"{_BANNER}\n",
         )
         append_execution_log(
-            f"{'='*80}\n"
-            f"JOB STARTED - {datetime.now().isoformat()}\n"
+            f"{_BANNER}\n"
+            f"JOB STARTED - {started_at}\n"
             f"Job ID: {job_id}\n"
             f"Retry failed: {retry_failed}\n"
             f"Resume: {resume}\n"
-            f"{'='*80}\n",
+            f"{_BANNER}\n",
             workspace_path=workspace_path,
         )
 
@@ -122,45 +131,55 @@ def run_build_pipeline(
             progress_callback("meta", 10, "Starting Meta phase...")
             results = workflow.run(resume=resume)
 
+        finished_at = datetime.now().isoformat()
         _append_log(
-            f"\n{'='*80}",
-            f"JOB COMPLETED SUCCESSFULLY - {datetime.now().isoformat()}",
-            f"{'='*80}\n",
+            f"\n{_BANNER}",
+            f"JOB COMPLETED SUCCESSFULLY - {finished_at}",
+            f"{_BANNER}\n",
         )
         append_execution_log(
-            f"{'='*80}\n"
-            f"JOB COMPLETED - {datetime.now().isoformat()}\n"
+            f"{_BANNER}\n"
+            f"JOB COMPLETED - {finished_at}\n"
             f"Status: {results.get('status')}\n"
-            f"{'='*80}\n",
+            f"{_BANNER}\n",
             workspace_path=workspace_path,
         )
         return results
 
     except Exception as e:
+        failed_at = datetime.now().isoformat()
+        if isinstance(e, WorkflowCancelled):
+            # User-initiated stop: record it without a traceback
+            _append_log(f"\n{_BANNER}", f"JOB CANCELLED - {failed_at}", f"{_BANNER}\n")
+            append_execution_log(
+                f"{_BANNER}\n"
+                f"JOB CANCELLED - {failed_at}\n"
+                f"{_BANNER}\n",
+                workspace_path=workspace_path,
+            )
+            raise
         error_trace = traceback.format_exc()
         _append_log(
-            f"\n{'='*80}",
-            f"ERROR IN WORKFLOW - {datetime.now().isoformat()}",
-            f"{'='*80}",
+            f"\n{_BANNER}",
+            f"ERROR IN WORKFLOW - {failed_at}",
+            f"{_BANNER}",
             f"Error Type: {type(e).__name__}",
             f"Error Message: {str(e)}",
             f"Traceback:\n{error_trace}",
-            f"{'='*80}\n",
+            f"{_BANNER}\n",
         )
         append_execution_log(
-            f"{'='*80}\n"
-            f"JOB FAILED - {datetime.now().isoformat()}\n"
+            f"{_BANNER}\n"
+            f"JOB FAILED - {failed_at}\n"
             f"Error: {type(e).__name__}: {e}\n"
-            f"{'='*80}\n",
+            f"{_BANNER}\n",
             workspace_path=workspace_path,
         )
         raise
     finally:
+        if error_log is not None:
+            error_log.close()
         clear_thread_workspace()
-        if original_workspace is not None:
-            os.environ["WORKSPACE_PATH"] = original_workspace
-        elif "WORKSPACE_PATH" in os.environ:
-            del os.environ["WORKSPACE_PATH"]
         # Clear callback manager
         from llama_index.core import Settings
         from llama_index.core.callbacks import CallbackManager
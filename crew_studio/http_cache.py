@@ -0,0 +1,27 @@
+"""Conditional-GET helpers shared by the Flask app and the FastAPI front."""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from werkzeug.http import parse_etags
+
+
+def job_state_etag(job: Dict[str, Any], *extra) -> str:
+    """Unquoted ETag for responses derived from a job's progress state (plus ``extra``).
+
+    ``last_message`` is capped, so its newest entry rather than its length
+    tells polls apart.
+    """
+    messages = job.get('last_message') or []
+    key = f"{job['status']}|{job['progress']}|{job['current_phase']}|{messages[-1] if messages else ''}"
+    for part in extra:
+        key += f"|{part}"
+    return hashlib.blake2b(key.encode('utf-8', 'replace'), digest_size=8).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header value names ``etag`` (weak comparison, or ``*``)."""
+    if not if_none_match:
+        return False
+    return parse_etags(if_none_match).contains_weak(etag)
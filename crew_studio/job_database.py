@@ -5,9 +5,10 @@ Stores all job metadata, status, progress, and messages.
 import sqlite3
 import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 from contextlib import contextmanager
 
 
@@ -18,28 +19,70 @@ class JobDatabase:
         """Initialize database connection and ensure schema exists."""
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
         self._init_schema()
     
+    def _thread_conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening and tuning it on first use.
+
+        Connections live for the life of the thread, so the file open and the
+        PRAGMAs below are paid once per worker instead of once per query.
+        WAL lets readers and the single writer proceed concurrently;
+        synchronous=NORMAL is durable across crashes in WAL mode and skips
+        the fsync on every commit.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
     @contextmanager
     def _get_conn(self):
         """Get a database connection with automatic commit/rollback.
 
         Uses WAL journal mode and a generous busy_timeout so concurrent
-        readers never block writers and vice-versa.
+        readers never block writers and vice-versa. Inside ``transaction()``
+        the thread's open connection is reused and committed by the caller.
         """
-        conn = sqlite3.connect(str(self.db_path), timeout=10)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=5000")
-        conn.row_factory = sqlite3.Row
+        tx_conn = getattr(self._local, 'tx_conn', None)
+        if tx_conn is not None:
+            yield tx_conn
+            return
+        conn = self._thread_conn()
         try:
             yield conn
             conn.commit()
         except Exception:
             conn.rollback()
             raise
-        finally:
-            conn.close()
     
+    @contextmanager
+    def transaction(self):
+        """Group several calls on this thread into one connection and one commit.
+
+        Every JobDatabase method called inside the block shares the same
+        connection; the block commits once on exit or rolls back on error.
+        Nested blocks join the outer transaction. Keep the block short — the
+        write lock is held from the first write until it exits.
+        """
+        if getattr(self._local, 'tx_conn', None) is not None:
+            yield self._local.tx_conn
+            return
+        with self._get_conn() as conn:
+            self._local.tx_conn = conn
+            try:
+                yield conn
+            finally:
+                self._local.tx_conn = None
+
     def _init_schema(self):
         """Create jobs and documents tables if they don't exist."""
         with self._get_conn() as conn:
@@ -91,6 +134,7 @@ class JobDatabase:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON jobs(status)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON jobs(created_at DESC)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_doc_job ON documents(job_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_doc_job_type ON documents(job_id, file_type)")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS refinements (
                     id TEXT PRIMARY KEY,
@@ -434,6 +478,27 @@ class JobDatabase:
                 return None
             return self._row_to_dict(row)
     
+    def get_job_progress(self, job_id: str, recent: int = 10) -> Optional[Dict[str, Any]]:
+        """Progress fields of a job plus its ``recent`` newest messages.
+
+        Reads only the columns a progress poll needs (and the owner/team for
+        access checks) instead of the full row with vision, results and costs.
+        """
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT id, status, progress, current_phase, last_message, owner_id, team_id "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if not row:
+            return None
+        job = dict(row)
+        try:
+            messages = json.loads(job['last_message'] or '[]')
+        except (json.JSONDecodeError, TypeError):
+            messages = []
+        job['last_message'] = messages[-recent:] if isinstance(messages, list) else []
+        return job
+
     def get_all_jobs(self, owner_id: Optional[str] = None,
                      team_ids: Optional[List[str]] = None,
                      is_admin: bool = False) -> List[Dict[str, Any]]:
@@ -529,6 +594,14 @@ class JobDatabase:
             ).fetchone()
             return row[0] if row else 0
 
+    def count_active_jobs(self) -> int:
+        """Return the number of queued or running jobs (served by idx_status)."""
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()
+            return row[0] if row else 0
+
     def get_jobs_paginated(
         self,
         limit: int = 10,
@@ -560,7 +633,50 @@ class JobDatabase:
         with self._get_conn() as conn:
             rows = conn.execute(sql, params).fetchall()
             return [self._row_to_dict(row) for row in rows]
-    
+
+    def iter_job_summaries(
+        self,
+        limit: int = 10,
+        offset: int = 0,
+        vision_filter: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        vision_chars: int = 103,
+        owner_id: Optional[str] = None,
+        team_ids: Optional[List[str]] = None,
+        is_admin: bool = False,
+        team_id: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield list-view job rows one at a time.
+
+        Only the columns needed by job listings are selected and ``vision`` is
+        cut to ``vision_chars`` in SQL, so results/last_message blobs are never
+        read. Ask for one character more than you display to tell whether the
+        vision was cut; its full length is never computed.
+        """
+        where, params = self._build_where(
+            vision_filter, status_filter, owner_id=owner_id, team_ids=team_ids, is_admin=is_admin, team_id=team_id
+        )
+
+        col = sort_by if sort_by in self._SORTABLE_COLUMNS else "created_at"
+        direction = "ASC" if sort_order == "asc" else "DESC"
+        collate = " COLLATE NOCASE" if col == "vision" else ""
+
+        sql = (
+            "SELECT id, SUBSTR(vision, 1, ?) AS vision, "
+            "status, progress, current_phase, created_at, completed_at, metadata "
+            f"FROM jobs{where} ORDER BY {col}{collate} {direction} LIMIT ? OFFSET ?"
+        )
+        with self._get_conn() as conn:
+            for row in conn.execute(sql, [vision_chars, *params, limit, offset]):
+                job = dict(row)
+                try:
+                    job['metadata'] = json.loads(job['metadata']) if job.get('metadata') else {}
+                except (json.JSONDecodeError, TypeError):
+                    job['metadata'] = {}
+                yield job
+
     def update_job(self, job_id: str, updates: Dict[str, Any]) -> bool:
         """Update job fields. Returns True if job was found and updated."""
         if not updates:
@@ -619,7 +735,17 @@ class JobDatabase:
         status (completed, failed, cancelled) — prevents late progress
         writes from reverting final state.
         """
-        with self._get_conn() as conn:
+        terminal = ','.join('?' for _ in self._TERMINAL_STATUSES)
+        with self._get_conn() as conn:
+            if not message:
+                # Percent-only ticks don't touch last_message, so the guarded
+                # UPDATE alone decides whether the job is still writable.
+                cursor = conn.execute(
+                    f"UPDATE jobs SET current_phase = ?, progress = ? WHERE id = ? AND status NOT IN ({terminal})",
+                    (phase, progress, job_id, *self._TERMINAL_STATUSES),
+                )
+                return cursor.rowcount > 0
+
             row = conn.execute(
                 "SELECT status, last_message FROM jobs WHERE id = ?", (job_id,)
             ).fetchone()
@@ -628,31 +754,24 @@ class JobDatabase:
             if row["status"] in self._TERMINAL_STATUSES:
                 return False
 
-            updates: Dict[str, Any] = {
-                "current_phase": phase,
-                "progress": progress,
-            }
-
-            if message:
-                try:
-                    messages = json.loads(row["last_message"] or "[]")
-                except (json.JSONDecodeError, TypeError):
-                    messages = []
-                messages.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "phase": phase,
-                    "message": message,
-                })
-                messages = messages[-50:]
-                updates["last_message"] = json.dumps(messages)
-
-            set_clause = ", ".join(f"{k} = ?" for k in updates)
-            values = list(updates.values()) + [job_id]
-            conn.execute(
-                f"UPDATE jobs SET {set_clause} WHERE id = ? AND status NOT IN ({','.join('?' for _ in self._TERMINAL_STATUSES)})",
-                values + list(self._TERMINAL_STATUSES),
+            try:
+                messages = json.loads(row["last_message"] or "[]")
+            except (json.JSONDecodeError, TypeError):
+                messages = []
+            messages.append({
+                "timestamp": datetime.now().isoformat(),
+                "phase": phase,
+                "message": message,
+            })
+            messages = messages[-50:]
+
+            # The job can still go terminal between the SELECT and here; the
+            # guarded UPDATE's row count is what says the write landed.
+            cursor = conn.execute(
+                f"UPDATE jobs SET current_phase = ?, progress = ?, last_message = ? WHERE id = ? AND status NOT IN ({terminal})",
+                (phase, progress, json.dumps(messages), job_id, *self._TERMINAL_STATUSES),
             )
-            return True
+            return cursor.rowcount > 0
     
     def mark_started(self, job_id: str):
         """Mark job as started (running)."""
@@ -766,6 +885,25 @@ class JobDatabase:
             'uploaded_at': now,
         }
 
+    def add_documents(self, job_id: str, docs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Record several documents for a job with one INSERT batch and commit.
+
+        Each item carries the ``add_document`` fields: ``id``, ``filename``,
+        ``original_name``, ``file_type``, ``file_size`` and ``stored_path``.
+        """
+        now = datetime.now().isoformat()
+        records = [{**d, 'job_id': job_id, 'uploaded_at': now} for d in docs]
+        if not records:
+            return []
+        with self._get_conn() as conn:
+            conn.executemany("""
+                INSERT INTO documents (id, job_id, filename, original_name,
+                                       file_type, file_size, stored_path, uploaded_at)
+                VALUES (:id, :job_id, :filename, :original_name,
+                        :file_type, :file_size, :stored_path, :uploaded_at)
+            """, records)
+        return records
+
     def get_job_documents(self, job_id: str) -> List[Dict[str, Any]]:
         """Get all documents attached to a job."""
         with self._get_conn() as conn:
@@ -775,6 +913,43 @@ class JobDatabase:
             ).fetchall()
             return [dict(r) for r in rows]
 
+    def get_job_text_documents(self, job_id: str, types: Iterable[str]) -> List[Dict[str, Any]]:
+        """Get a job's documents whose ``file_type`` is one of ``types``."""
+        types = tuple(types)
+        if not types:
+            return []
+        placeholders = ",".join("?" * len(types))
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM documents WHERE job_id = ? AND file_type IN ({placeholders}) "
+                "ORDER BY uploaded_at",
+                (job_id, *types),
+            ).fetchall()
+            return [dict(r) for r in rows]
+
+    def find_report_document(self, job_id: str, keywords: tuple) -> Optional[Dict[str, Any]]:
+        """Return the first-uploaded document whose name contains a keyword.
+
+        Falls back to the first-uploaded document when none match, or None if
+        the job has no documents. Keywords are matched case-insensitively.
+        """
+        match = " OR ".join("instr(lower(original_name), ?) > 0" for _ in keywords) or "0"
+        with self._get_conn() as conn:
+            row = conn.execute(
+                f"SELECT * FROM documents WHERE job_id = ? "
+                f"ORDER BY CASE WHEN {match} THEN 0 ELSE 1 END, uploaded_at, rowid LIMIT 1",
+                (job_id, *(kw.lower() for kw in keywords)),
+            ).fetchone()
+            return dict(row) if row else None
+
+    def get_document(self, job_id: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get one of a job's documents by id."""
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT * FROM documents WHERE id = ? AND job_id = ?", (doc_id, job_id)
+            ).fetchone()
+            return dict(row) if row else None
+
     def delete_document(self, doc_id: str) -> bool:
         """Delete a document record. Returns True if found."""
         with self._get_conn() as conn:
@@ -808,6 +983,21 @@ class JobDatabase:
             'error': None,
         }
 
+    def start_refinement(
+        self,
+        refinement_id: str,
+        job_id: str,
+        prompt: str,
+        file_path: Optional[str] = None,
+        message: str = 'Refinement started.',
+    ) -> Dict[str, Any]:
+        """Create a refinement and mark the job running/refining in one commit."""
+        with self.transaction():
+            refinement = self.create_refinement(refinement_id, job_id, prompt, file_path)
+            self.update_job(job_id, {'status': 'running'})
+            self.update_progress(job_id, 'refining', 0, message)
+        return refinement
+
     def complete_refinement(self, refinement_id: str) -> bool:
         """Mark refinement as completed."""
         now = datetime.now().isoformat()
@@ -946,6 +1136,25 @@ class JobDatabase:
                 'skipped': row['skipped'] or 0,
             }
 
+    def get_migration_outcome(self, job_id: str) -> Dict[str, Any]:
+        """Return failed/pending counts and the first failure's error in one query."""
+        with self._get_conn() as conn:
+            row = conn.execute("""
+                SELECT
+                    SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed,
+                    SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending,
+                    (SELECT error FROM migration_issues
+                     WHERE job_id = ? AND status = 'failed'
+                     ORDER BY created_at, rowid LIMIT 1) as first_error
+                FROM migration_issues
+                WHERE job_id = ?
+            """, (job_id, job_id)).fetchone()
+            return {
+                'failed': row['failed'] or 0,
+                'pending': row['pending'] or 0,
+                'first_error': row['first_error'],
+            }
+
     def fail_stale_migrations(self, job_id: str) -> int:
         """Mark any migration_issues still in 'running' or 'pending' state as 'failed'.
 
@@ -8,25 +8,70 @@ import os
 os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
 
 import fnmatch
+import functools
+import hashlib
+import heapq
 import io
+import itertools
 import json
 import logging
+import mmap
+import queue
 import re
+import signal
+import stat
+import tempfile
 import uuid
 import zipfile
 import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from urllib.parse import unquote
-from flask import Flask, render_template, request, jsonify, send_from_directory, send_file, Response
+from flask import Flask, g, render_template, request, jsonify, send_file, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.utils import secure_filename
+from werkzeug.wsgi import wrap_file
 from flask_cors import CORS
 from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 from src.llamaindex_crew.config import ConfigLoader, SecretConfig
 from crew_studio.job_database import JobDatabase
+from crew_studio.http_cache import etag_matches, job_state_etag
+from crew_studio.bounded_cache import BoundedCache
+
+try:
+    from src.llamaindex_crew.backends import registry as _backend_registry
+except ImportError as _e:
+    logger.warning("Backend registry unavailable, only opl-ai-team will be offered: %s", _e)
+    _backend_registry = None
+
+# Task counts and budget reports degrade to errors when these are unavailable
+try:
+    from src.llamaindex_crew.orchestrator.task_manager import TaskManager
+    from src.llamaindex_crew.budget.tracker import EnhancedBudgetTracker
+except ImportError as _e:
+    logger.warning("Task manager/budget tracker unavailable: %s", _e)
+    TaskManager = None
+    EnhancedBudgetTracker = None
+
+# Health checks report the LLM as unhealthy when its factory is unavailable
+try:
+    from src.llamaindex_crew.utils.llm_config import get_llm_for_agent
+except ImportError as _e:
+    logger.warning("LLM factory unavailable: %s", _e)
+    get_llm_for_agent = None
 
 # Load environment variables
 load_dotenv()
@@ -47,6 +92,46 @@ web_dir = current_dir
 app = Flask(__name__, 
             static_folder=str(web_dir / 'static') if (web_dir / 'static').exists() else None,
             template_folder=str(web_dir / 'templates') if (web_dir / 'templates').exists() else None)
+# Templates ship with the image; don't stat them for changes on every render.
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize responses with orjson, falling back to the stdlib provider.
+
+    Datetimes are passed through to Flask's default handler so the wire
+    format (HTTP dates) matches ``DefaultJSONProvider``.
+    """
+
+    _OPTIONS = 0
+
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._OPTIONS).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of the base
+        # class's dumps() -> str -> f-string -> encode round trip.
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(
+                obj, default=self.default, option=self._OPTIONS | orjson.OPT_APPEND_NEWLINE,
+            )
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+if orjson is not None:
+    OrjsonProvider._OPTIONS = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+    app.json = OrjsonProvider(app)
 
 def _cors_origins() -> list:
     raw = os.getenv("CORS_ALLOWED_ORIGINS", "").strip()
@@ -61,21 +146,131 @@ db_path = Path(os.getenv("JOB_DB_PATH", "./crew_jobs.db"))
 job_db = JobDatabase(db_path)
 print(f"✅ Job database initialized at: {db_path.absolute()}")
 
-# Base workspace path (contains job-specific folders)
-base_workspace_path = Path(os.getenv("WORKSPACE_PATH", "./workspace"))
+# Base workspace path (contains job-specific folders). Resolved once here so
+# every job's stored workspace_path is already absolute and symlink-free.
+base_workspace_path = Path(os.getenv("WORKSPACE_PATH", "./workspace")).resolve()
 base_workspace_path.mkdir(parents=True, exist_ok=True)
 
+# ── Background job execution ─────────────────────────────────────────────
+# Pipelines run on one bounded pool instead of a new thread per request.
+# Jobs beyond JOB_WORKERS wait in the pool's queue with status 'queued'.
+
+
+class _DaemonJobPool:
+    """Fixed set of daemon worker threads fed from a queue.
+
+    ThreadPoolExecutor workers are joined at interpreter exit, before any
+    atexit hook runs, so Ctrl-C or a redeploy would wait for every running and
+    queued LLM job to finish. Daemon workers let the process exit at once;
+    jobs it abandons keep their 'running'/'queued' status in the database and
+    resume_pending_jobs restarts them on the next start.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self._work_queue: "queue.Queue[tuple]" = queue.Queue()
+        # Submitted work neither started nor cancelled. Cancelled futures stay
+        # in _work_queue until a worker skips them, so its size overcounts.
+        self._waiting = 0
+        self._waiting_lock = threading.Lock()
+        for i in range(max_workers):
+            threading.Thread(
+                target=self._worker, name=f"{thread_name_prefix}_{i}", daemon=True,
+            ).start()
+
+    @property
+    def queued(self) -> int:
+        """Number of submitted jobs still waiting for a free worker."""
+        return self._waiting
+
+    def _leave_queue(self) -> None:
+        with self._waiting_lock:
+            self._waiting -= 1
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        with self._waiting_lock:
+            self._waiting += 1
+        # A future can only be cancelled before a worker starts it, so this
+        # and the start in _worker never both count the same job.
+        future.add_done_callback(lambda f: f.cancelled() and self._leave_queue())
+        self._work_queue.put((future, fn, args, kwargs))
+        return future
+
+    def _worker(self) -> None:
+        while True:
+            future, fn, args, kwargs = self._work_queue.get()
+            # Skips work cancelled (by cancel_job) while it was still queued
+            if not future.set_running_or_notify_cancel():
+                continue
+            self._leave_queue()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", max(4, (os.cpu_count() or 1) * 2)))
+_JOB_EXECUTOR = _DaemonJobPool(max_workers=JOB_WORKERS, thread_name_prefix="job-runner")
+# Backpressure: once this many jobs are waiting for a worker, new job requests
+# get 429 instead of joining the backlog. Defaults to a few jobs per worker;
+# set JOB_QUEUE_MAX=0 to disable the limit.
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", JOB_WORKERS * 4))
+
+# In-flight work per job, so cancel_job can drop work that has not started yet.
+_job_futures: Dict[str, Future] = {}
+_job_futures_lock = threading.Lock()
+
+
+def _submit_job(job_id: str, fn, *args, **kwargs) -> Future:
+    """Queue ``fn`` for ``job_id`` on the shared job pool."""
+    future = _JOB_EXECUTOR.submit(fn, *args, **kwargs)
+    with _job_futures_lock:
+        _job_futures[job_id] = future
+
+    def _done(f: Future) -> None:
+        with _job_futures_lock:
+            if _job_futures.get(job_id) is f:
+                del _job_futures[job_id]
+        # Executors swallow exceptions; surface anything that escaped the job
+        if not f.cancelled() and f.exception() is not None:
+            logger.error("Background job %s raised", job_id, exc_info=f.exception())
+
+    future.add_done_callback(_done)
+    return future
+
+
+def _job_queue_depth() -> int:
+    """Number of submitted jobs still waiting for a free worker."""
+    return _JOB_EXECUTOR.queued
+
+
+def _job_queue_full() -> bool:
+    """True when JOB_QUEUE_MAX jobs are already waiting (never when it is 0)."""
+    return JOB_QUEUE_MAX > 0 and _job_queue_depth() >= JOB_QUEUE_MAX
+
 # ── Register migration blueprint ─────────────────────────────────────────
 from crew_studio.migration.blueprint import migration_bp  # noqa: E402
 from crew_studio.refactor.blueprint import refactor_bp  # noqa: E402
 from crew_studio.import_flow.blueprint import import_bp  # noqa: E402
 app.config["JOB_DB"] = job_db
 app.config["WORKSPACE_PATH"] = str(base_workspace_path)
+# Reject oversized request bodies (uploads, source archives) with 413 while
+# parsing, before any of it is written to the workspace.
+app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_REQUEST_MB", "512")) * 1024 * 1024
+
 app.register_blueprint(migration_bp)
 app.register_blueprint(refactor_bp)
 app.register_blueprint(import_bp)
 
 
+@app.errorhandler(413)
+def request_too_large(_e):
+    limit_mb = app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024)
+    return jsonify({'error': f'Request body exceeds {limit_mb} MB'}), 413
+
+
 # ---------------------------------------------------------------------------
 # Flask auth middleware — validates that the requesting user owns (or can
 # access) the job referenced in the URL. The ASGI layer already verified the
@@ -83,6 +278,19 @@ app.register_blueprint(import_bp)
 # that reach Flask via the WSGI fallback.
 # ---------------------------------------------------------------------------
 
+def _get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """``job_db.get_job`` memoized for the current request.
+
+    The ownership hook and the route handler both look the job up; this makes
+    the second lookup free. Only use it for reads that happen before the
+    handler writes to the job — re-read with ``job_db.get_job`` after a write.
+    """
+    cache = g.setdefault('_jobs', {})
+    if job_id not in cache:
+        cache[job_id] = job_db.get_job(job_id)
+    return cache[job_id]
+
+
 @app.before_request
 def enforce_job_ownership():
     if not request.path.startswith("/api/"):
@@ -108,7 +316,7 @@ def enforce_job_ownership():
         job_id = request.args.get("job_id")
 
     if job_id:
-        job = job_db.get_job(job_id)
+        job = _get_job(job_id)
         if not job:
             return jsonify({"detail": "Job not found"}), 404
 
@@ -219,15 +427,73 @@ def resume_pending_jobs(override_job_db=None):
     logger.info("resume_pending_jobs: %d resumed, %d marked interrupted.", resumed, interrupted)
 
 
+# Progress-only ticks (same phase, no message) are written at most this often;
+# phase changes and messages are always written straight away.
+PROGRESS_MIN_INTERVAL = float(os.getenv("PROGRESS_MIN_INTERVAL", "0.25"))
+
+
+def _throttled_progress_callback(job_id: str):
+    """Build a progress callback that coalesces chatty percent updates.
+
+    Workflows report progress on every step; most ticks only move the
+    percentage. Those are collapsed to one UPDATE per PROGRESS_MIN_INTERVAL
+    so a busy job does not hold SQLite's write lock on every step. The latest
+    held-back tick is written by the next write or, if the workflow goes quiet
+    (e.g. a long LLM call), by a timer at the end of the window, so stored
+    progress never lags behind. Terminal writes (mark_completed/mark_failed)
+    set the final progress themselves.
+
+    The callback is also the workflow's cancellation point: once cancel_job
+    has marked the job cancelled, the next report raises ``WorkflowCancelled``
+    so no further agent steps (and LLM calls) run.
+    """
+    state = {'phase': None, 'at': 0.0, 'pending': None, 'timer': None}
+    # Serialises the callback and the flush timer so writes land in order
+    lock = threading.Lock()
+
+    def _flush_pending():
+        with lock:
+            state['timer'] = None
+            pending, state['pending'] = state['pending'], None
+            if pending is not None:
+                state['at'] = time.monotonic()
+                job_db.update_progress(job_id, *pending)
+
+    def progress_callback(phase: str, progress: int, message: str = None):
+        """Update job progress in real-time"""
+        with lock:
+            now = time.monotonic()
+            since = now - state['at']
+            if not message and phase == state['phase'] and since < PROGRESS_MIN_INTERVAL:
+                state['pending'] = (phase, progress)
+                if state['timer'] is None:
+                    timer = threading.Timer(PROGRESS_MIN_INTERVAL - since, _flush_pending)
+                    timer.daemon = True
+                    state['timer'] = timer
+                    timer.start()
+                return
+            # This write supersedes any held-back tick
+            state['pending'] = None
+            state['phase'] = phase
+            state['at'] = now
+            if job_db.update_progress(job_id, phase, progress, message):
+                return
+        # Refused writes mean the job reached a terminal status mid-run
+        job = job_db.get_job_progress(job_id)
+        if job and job['status'] == 'cancelled':
+            from src.llamaindex_crew.workflows.software_dev_workflow import WorkflowCancelled
+            raise WorkflowCancelled(f"Job {job_id} was cancelled")
+
+    return progress_callback
+
+
 def run_job_with_backend(job_id: str, vision: str, backend):
     """Run a job using the pluggable backend."""
     import traceback
     import logging
     logger = logging.getLogger(__name__)
     
-    def progress_callback(phase: str, progress: int, message: str = None):
-        """Update job progress in real-time."""
-        job_db.update_progress(job_id, phase, progress, message)
+    progress_callback = _throttled_progress_callback(job_id)
     
     try:
         # Mark job as started
@@ -252,11 +518,24 @@ def run_job_with_backend(job_id: str, vision: str, backend):
             job_db.mark_failed(job_id, error)
             
     except Exception as e:
+        if _is_workflow_cancelled(e):
+            logger.info("Job %s stopped after cancellation", job_id)
+            return
         error_msg = f"Backend execution failed: {str(e)}\n{traceback.format_exc()}"
         logger.error(error_msg)
         job_db.mark_failed(job_id, error_msg)
 
 
+def _is_workflow_cancelled(exc: BaseException) -> bool:
+    """True if ``exc`` is the workflow unwinding after cancel_job; the job row
+    already holds its terminal status."""
+    try:
+        from src.llamaindex_crew.workflows.software_dev_workflow import WorkflowCancelled
+    except ImportError:
+        return False
+    return isinstance(exc, WorkflowCancelled)
+
+
 def _is_import_mode_recommended_error(exc: BaseException) -> bool:
     """True if ``exc`` is MetaAgent's import-mode triage exception.
 
@@ -269,6 +548,14 @@ def _is_import_mode_recommended_error(exc: BaseException) -> bool:
     return isinstance(getattr(exc, "triage", None), dict)
 
 
+# Separator line around entries in crew_errors.log
+_LOG_BANNER = '=' * 80
+
+# Quota markers in a failed job's error text, matched in one pass without
+# lower-casing the whole (possibly traceback-sized) message.
+_QUOTA_RE = re.compile(r"QUOTA_EXHAUSTED|429|(?i:exceeded your current quota)")
+
+
 def run_job_async(
     job_id: str,
     vision: str,
@@ -308,9 +595,7 @@ def _run_job_async_impl(
     if job_config is None:
         job_config = config
     
-    def progress_callback(phase: str, progress: int, message: str = None):
-        """Update job progress in real-time"""
-        job_db.update_progress(job_id, phase, progress, message)
+    progress_callback = _throttled_progress_callback(job_id)
     
     try:
         # ── Guard: Skip build pipeline for migration jobs ───────────────
@@ -355,7 +640,10 @@ def _run_job_async_impl(
 
         job_workspace = Path(job['workspace_path'])
 
-        uploaded_docs = job_db.get_job_documents(job_id)
+        from crew_studio.reference_context import TEXT_TYPES
+
+        # Only text reference docs are indexed or inlined; filter them in SQL
+        uploaded_docs = job_db.get_job_text_documents(job_id, TEXT_TYPES)
         rag_manifest = {}
         if uploaded_docs:
             try:
@@ -445,6 +733,9 @@ def _run_job_async_impl(
                 )
 
     except Exception as e:
+        if _is_workflow_cancelled(e):
+            logger.info("Job %s stopped after cancellation", job_id)
+            return
         error_message = str(e)
         error_trace = traceback.format_exc()
 
@@ -561,24 +852,29 @@ def _run_job_async_impl(
             if job:
                 ws = Path(job['workspace_path'])
                 ws.mkdir(parents=True, exist_ok=True)
-                error_log_path = ws / "crew_errors.log"
-                with open(error_log_path, 'a') as f:
-                    f.write(f"\n{'='*80}\n")
-                    f.write(f"JOB FAILED - {datetime.now().isoformat()}\n")
-                    f.write(f"{'='*80}\n")
-                    f.write(f"Error Type: {type(e).__name__}\n")
-                    f.write(f"Error Message: {error_message}\n")
-                    f.write(f"Traceback:\n{error_trace}\n")
-                    f.write(f"{'='*80}\n\n")
+                entry = (
+                    f"\n{_LOG_BANNER}\n"
+                    f"JOB FAILED - {datetime.now().isoformat()}\n"
+                    f"{_LOG_BANNER}\n"
+                    f"Error Type: {type(e).__name__}\n"
+                    f"Error Message: {error_message}\n"
+                    f"Traceback:\n{error_trace}\n"
+                    f"{_LOG_BANNER}\n\n"
+                )
+                # One O_APPEND write: the entry lands whole even if another
+                # writer appends to the same log concurrently
+                fd = os.open(ws / "crew_errors.log", os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, entry.encode('utf-8', 'replace'))
+                finally:
+                    os.close(fd)
         except Exception as log_error:
             logger.error("Could not write to error log: %s", log_error)
         
         # Check if it's quota exhaustion
         is_quota_exhausted = (
-            'QUOTA_EXHAUSTED' in error_message or
-            hasattr(e, 'quota_exhausted') and e.quota_exhausted or
-            'exceeded your current quota' in error_message.lower() or
-            '429' in error_message
+            getattr(e, 'quota_exhausted', False)
+            or _QUOTA_RE.search(error_message) is not None
         )
         
         if is_quota_exhausted:
@@ -597,13 +893,21 @@ def _run_job_async_impl(
             job_db.mark_failed(job_id, error_message)
 
 
+@functools.cache
+def _index_html() -> str:
+    """Render the dashboard once; it takes no per-request context."""
+    return render_template('index.html')
+
+
 @app.route('/')
 def index():
     """Main dashboard page"""
     try:
-        return render_template('index.html')
+        resp = Response(_index_html(), mimetype='text/html')
     except Exception as e:
         return f"Error rendering template: {str(e)}", 500
+    resp.add_etag()
+    return resp.make_conditional(request)
 
 
 @app.route('/health')
@@ -620,6 +924,27 @@ def health():
     }), 200
 
 
+# Readiness is probed every few seconds; the checks behind it (LLM client
+# init, config load) are far slower than that, so results are reused for
+# HEALTH_TTL seconds and refreshed in the background once stale.
+HEALTH_TTL = float(os.getenv("HEALTH_TTL", "10"))
+# 'result' is swapped as one (checked_at, payload, status_code) tuple
+_health_cache: Dict[str, Any] = {'result': None}
+_health_refresh_lock = threading.Lock()
+_HEALTH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="health")
+
+
+def _refresh_health() -> None:
+    """Run the readiness checks and store the result; one refresh at a time."""
+    if not _health_refresh_lock.acquire(blocking=False):
+        return
+    try:
+        payload, code = _run_readiness_checks()
+        _health_cache['result'] = (time.monotonic(), payload, code)
+    finally:
+        _health_refresh_lock.release()
+
+
 @app.route('/health/ready')
 def health_ready():
     """
@@ -627,9 +952,32 @@ def health_ready():
     Verifies all critical dependencies are available
     Returns 200 if ready to serve requests, 503 if not ready
     """
-    import logging
-    
-    logger = logging.getLogger(__name__)
+    result = _health_cache['result']
+    if result is None:
+        # First probe: nothing to serve yet, so check inline
+        with _health_refresh_lock:
+            if _health_cache['result'] is None:
+                payload, code = _run_readiness_checks()
+                _health_cache['result'] = (time.monotonic(), payload, code)
+            result = _health_cache['result']
+    elif time.monotonic() - result[0] >= HEALTH_TTL:
+        # Serve the last result; the next probe sees the refreshed one
+        _HEALTH_EXECUTOR.submit(_refresh_health)
+    _, payload, code = result
+    # Job queue is cheap and changes quickly, so it is always reported live
+    # (informational; a full queue sheds load with 429s)
+    checks = dict(payload['checks'])
+    checks['job_queue'] = {
+        'status': 'saturated' if _job_queue_full() else 'healthy',
+        'workers': JOB_WORKERS,
+        'queued': _job_queue_depth(),
+        'max_queued': JOB_QUEUE_MAX or None,
+    }
+    return jsonify({**payload, 'checks': checks}), code
+
+
+def _run_readiness_checks():
+    """Run every readiness check; returns ``(payload, status_code)``."""
     health_status = {
         'status': 'ready',
         'timestamp': datetime.now().isoformat(),
@@ -641,7 +989,6 @@ def health_ready():
     # Check 1: Configuration
     try:
         if config is None:
-            from ..config import ConfigLoader
             test_config = ConfigLoader.load()
         else:
             test_config = config
@@ -662,9 +1009,9 @@ def health_ready():
     # Check 2: Workspace accessibility
     try:
         base_workspace_path.mkdir(parents=True, exist_ok=True)
-        test_file = base_workspace_path / '.health_check'
-        test_file.write_text('health check')
-        test_file.unlink()
+        # access(2) reports EROFS/EACCES without creating and deleting a file
+        if not os.access(base_workspace_path, os.W_OK | os.X_OK):
+            raise PermissionError(f'{base_workspace_path} is not writable')
         
         health_status['checks']['workspace'] = {
             'status': 'healthy',
@@ -681,7 +1028,8 @@ def health_ready():
     
     # Check 3: LLM connectivity (light check)
     try:
-        from ..utils.llm_config import get_llm_for_agent
+        if get_llm_for_agent is None:
+            raise RuntimeError("LLM factory unavailable")
         
         # Only perform actual LLM check if config is healthy
         if health_status['checks']['config']['status'] == 'healthy':
@@ -707,7 +1055,7 @@ def health_ready():
     
     # Check 4: Job storage
     try:
-        job_count = len(job_db.get_all_jobs())
+        job_count = job_db.count_active_jobs()
         health_status['checks']['job_storage'] = {
             'status': 'healthy',
             'message': 'Job storage accessible',
@@ -724,10 +1072,10 @@ def health_ready():
     # Overall status
     if all_healthy:
         health_status['status'] = 'ready'
-        return jsonify(health_status), 200
+        return health_status, 200
     else:
         health_status['status'] = 'not_ready'
-        return jsonify(health_status), 503
+        return health_status, 503
 
 
 @app.route('/health/live')
@@ -743,6 +1091,13 @@ def health_live():
     }), 200
 
 
+# Every /health/llm hit is a paid completion; monitors polling it reuse the
+# last probe for LLM_HEALTH_TTL seconds, and concurrent hits share one probe.
+LLM_HEALTH_TTL = float(os.getenv("LLM_HEALTH_TTL", "30"))
+_llm_health_cache: Dict[str, Any] = {'result': None}
+_llm_health_lock = threading.Lock()
+
+
 @app.route('/health/llm')
 def health_llm():
     """
@@ -750,6 +1105,17 @@ def health_llm():
     Actually tests LLM connectivity with a real API call
     Returns 200 if LLM is accessible, 503 if not
     """
+    with _llm_health_lock:
+        result = _llm_health_cache['result']
+        if result is None or time.monotonic() - result[0] >= LLM_HEALTH_TTL:
+            payload, code = _run_llm_check()
+            result = _llm_health_cache['result'] = (time.monotonic(), payload, code)
+    _, payload, code = result
+    return jsonify(payload), code
+
+
+def _run_llm_check():
+    """Probe the LLM with a real completion; returns ``(payload, status_code)``."""
     import logging
     import traceback
     
@@ -764,7 +1130,6 @@ def health_llm():
     try:
         # Load config
         if config is None:
-            from ..config import ConfigLoader
             test_config = ConfigLoader.load()
         else:
             test_config = config
@@ -776,14 +1141,14 @@ def health_llm():
         }
         
         # Test LLM connectivity
-        from ..utils.llm_config import get_llm_for_agent
+        if get_llm_for_agent is None:
+            raise RuntimeError("LLM factory unavailable")
         
         llm = get_llm_for_agent("worker", test_config)
         
         # Perform a lightweight test completion
         test_prompt = "Say 'OK' if you can respond."
         
-        import time
         start_time = time.time()
         response = llm.complete(test_prompt)
         response_time = time.time() - start_time
@@ -796,7 +1161,7 @@ def health_llm():
         }
         
         health_status['status'] = 'healthy'
-        return jsonify(health_status), 200
+        return health_status, 200
         
     except Exception as e:
         error_trace = traceback.format_exc()
@@ -808,15 +1173,48 @@ def health_llm():
         }
         logger.error(f"Health check - LLM deep check failed: {e}")
         logger.debug(f"Traceback: {error_trace}")
-        return jsonify(health_status), 503
+        return health_status, 503
 
 
 import subprocess
 
 # ── GitHub / Repomix integration ─────────────────────────────────────────────
 
+def _run_isolated(cmd: list, timeout: float) -> subprocess.CompletedProcess:
+    """Run ``cmd`` in its own session, killing the whole process group on timeout.
+
+    ``npx`` forks node, which forks git; ``subprocess.run(timeout=...)`` only
+    kills ``npx`` and would leave the rest running with their pipes and clone
+    directories open. stdin is closed so nothing can block on a prompt.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.communicate()
+        raise
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+# Repomix runs packed concurrently per job (each is its own npx process).
+REPOMIX_WORKERS = int(os.getenv("REPOMIX_WORKERS", "4"))
+# Distinct GitHub URLs accepted per job; each is a multi-minute clone or pack.
+MAX_GITHUB_URLS = int(os.getenv("MAX_GITHUB_URLS", "10"))
+
+# Groups: owner, repo (a trailing ``.git`` is part of the repo group).
 GITHUB_URL_RE = re.compile(
-    r'^https?://github\.com/[\w.\-]+/[\w.\-]+(/.*)?$'
+    r'^https?://github\.com/([\w.\-]+)/([\w.\-]+)(/.*)?$'
 )
 
 
@@ -825,33 +1223,49 @@ def _is_github_url(url: str) -> bool:
     return bool(GITHUB_URL_RE.match(url.strip()))
 
 
-def _run_repomix(github_url: str, job_workspace: Path, job_id: str) -> Optional[Dict[str, Any]]:
+def _github_repo_name(match: "re.Match[str]") -> str:
+    """``owner/repo`` from a GITHUB_URL_RE match."""
+    return f"{match.group(1)}/{match.group(2).removesuffix('.git')}"
+
+
+def _run_repomix(
+    github_url: str, job_workspace: Path, job_id: str, repo_name: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
     """
     Use Repomix to pack a GitHub repo into an AI-friendly file.
     Returns dict with metadata or None on failure.
-    Stores the packed output in workspace/docs/.
+    Stores the packed output in workspace/docs/; the returned ``doc`` row is
+    not yet recorded — pass it to ``job_db.add_documents``.
+    ``repo_name`` (``owner/repo``) is taken from the URL when not given.
     """
     import logging
     logger = logging.getLogger(__name__)
 
-    # Use absolute paths to avoid CWD issues
-    abs_workspace = job_workspace.resolve()
-    docs_dir = abs_workspace / 'docs'
-    docs_dir.mkdir(parents=True, exist_ok=True)
-    output_file = docs_dir / f"repomix-{job_id}.xml"
-
     # Normalise URL: strip trailing slash, /tree/branch etc
     clean_url = github_url.strip().rstrip('/')
 
-    # Extract repo name early for logging
-    parts = clean_url.rstrip('/').split('/')
-    repo_name = '/'.join(parts[-2:]) if len(parts) >= 2 else parts[-1]
+    if repo_name is None:
+        match = GITHUB_URL_RE.match(clean_url)
+        if match:
+            repo_name = _github_repo_name(match)
+        else:
+            parts = clean_url.split('/')
+            repo_name = '/'.join(parts[-2:]) if len(parts) >= 2 else parts[-1]
+
+    # Use absolute paths to avoid CWD issues. One output file per URL (keyed
+    # by its document id): URLs for the same owner/repo, e.g. with and
+    # without /tree/<branch>, are packed concurrently and must not share one.
+    abs_workspace = job_workspace.resolve()
+    docs_dir = abs_workspace / 'docs'
+    docs_dir.mkdir(parents=True, exist_ok=True)
+    doc_id = str(uuid.uuid4())
+    output_file = docs_dir / f"repomix-{job_id}-{repo_name.replace('/', '-')}-{doc_id[:8]}.xml"
 
     logger.info(f"Starting Repomix for {repo_name}: {clean_url}")
     logger.info(f"Output path: {output_file}")
 
     try:
-        result = subprocess.run(
+        result = _run_isolated(
             [
                 'npx', '-y', 'repomix@latest',
                 '--remote', clean_url,
@@ -859,8 +1273,6 @@ def _run_repomix(github_url: str, job_workspace: Path, job_id: str) -> Optional[
                 '--style', 'xml',
                 '--compress',
             ],
-            capture_output=True,
-            text=True,
             timeout=600,  # 10 min max for large repos
         )
 
@@ -885,20 +1297,16 @@ def _run_repomix(github_url: str, job_workspace: Path, job_id: str) -> Optional[
 
         logger.info(f"Repomix packed {repo_name} → {file_size} bytes")
 
-        # Record as a document in DB
-        doc_id = str(uuid.uuid4())
-        doc = job_db.add_document(
-            doc_id=doc_id,
-            job_id=job_id,
-            filename=output_file.name,
-            original_name=f"github:{repo_name}",
-            file_type='xml',
-            file_size=file_size,
-            stored_path=str(output_file),
-        )
-
+        # Document row; the caller records all packed repos in one batch
         return {
-            'doc': doc,
+            'doc': {
+                'id': doc_id,
+                'filename': output_file.name,
+                'original_name': f"github:{repo_name}",
+                'file_type': 'xml',
+                'file_size': file_size,
+                'stored_path': str(output_file),
+            },
             'repo': repo_name,
             'size': file_size,
         }
@@ -1090,35 +1498,60 @@ def _push_build_to_github(job_id: str, job_workspace: Path, job_db) -> Optional[
         raise RuntimeError(str(e)) from e
 
 
-ALLOWED_EXTENSIONS = {
+ALLOWED_EXTENSIONS = frozenset({
     'txt', 'md', 'pdf', 'json', 'yaml', 'yml', 'csv', 'xml',
     'py', 'js', 'ts', 'java', 'go', 'rs', 'rb', 'sh',
     'html', 'css', 'sql', 'proto', 'graphql',
     'png', 'jpg', 'jpeg', 'svg',
     'doc', 'docx', 'pptx', 'xlsx',
-}
+})
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB per file
 MAX_FILES_PER_JOB = 20
 
 
+def _file_extension(filename: str) -> str:
+    """Lower-cased text after the last dot, or '' when there is none."""
+    i = filename.rfind('.')
+    return filename[i + 1:].lower() if i != -1 else ''
+
+
 def _allowed_file(filename: str) -> bool:
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return _file_extension(filename) in ALLOWED_EXTENSIONS
+
+
+def _doc_ids():
+    """Yield unique document ids for one batch of uploads.
+
+    Ids are opaque keys, not secrets: one random base per batch plus a
+    counter avoids an ``os.urandom`` call for every file.
+    """
+    base = uuid.uuid4().int
+    for i in itertools.count():
+        yield str(uuid.UUID(int=(base + i) % (1 << 128)))
 
 
 def _save_uploaded_files(job_id: str, job_workspace: Path, files) -> list:
     """Save uploaded files into workspace/docs/ and record in DB."""
+    return job_db.add_documents(job_id, _write_uploaded_files(job_workspace, files))
+
+
+def _write_uploaded_files(job_workspace: Path, files) -> list:
+    """Write uploaded files into workspace/docs/; returns document rows for add_documents."""
     docs_dir = job_workspace / 'docs'
     docs_dir.mkdir(parents=True, exist_ok=True)
+    doc_ids = _doc_ids()
     saved = []
     for f in files:
         if not f or not f.filename:
             continue
         if not _allowed_file(f.filename):
             continue
+        # Skip uploads that declare an oversized part before writing them out
+        if f.content_length and f.content_length > MAX_FILE_SIZE:
+            continue
         # Sanitise name: keep original for display, use uuid for storage
-        import werkzeug.utils as wu
-        safe_name = wu.secure_filename(f.filename)
-        doc_id = str(uuid.uuid4())
+        safe_name = secure_filename(f.filename)
+        doc_id = next(doc_ids)
         stored_name = f"{doc_id}_{safe_name}"
         stored_path = docs_dir / stored_name
         f.save(str(stored_path))
@@ -1126,17 +1559,15 @@ def _save_uploaded_files(job_id: str, job_workspace: Path, files) -> list:
         if file_size > MAX_FILE_SIZE:
             stored_path.unlink()
             continue
-        ext = safe_name.rsplit('.', 1)[1].lower() if '.' in safe_name else 'unknown'
-        doc = job_db.add_document(
-            doc_id=doc_id,
-            job_id=job_id,
-            filename=stored_name,
-            original_name=f.filename,
-            file_type=ext,
-            file_size=file_size,
-            stored_path=str(stored_path),
-        )
-        saved.append(doc)
+        ext = _file_extension(safe_name) or 'unknown'
+        saved.append({
+            'id': doc_id,
+            'filename': stored_name,
+            'original_name': f.filename,
+            'file_type': ext,
+            'file_size': file_size,
+            'stored_path': str(stored_path),
+        })
     return saved
 
 
@@ -1168,16 +1599,19 @@ def _extract_source_archive(job_workspace: Path, archive_file) -> int:
         # Detect single top-level folder to strip
         names = [n for n in zf.namelist() if not n.endswith('/')]
         top_dirs: set[str] = set()
+        has_any_slash = False
         for n in names:
-            first_segment = n.split('/')[0]
-            top_dirs.add(first_segment)
+            idx = n.find('/')
+            if idx >= 0:
+                has_any_slash = True
+                top_dirs.add(n[:idx])
+            else:
+                top_dirs.add(n)
 
         strip_prefix = ''
-        if len(top_dirs) == 1:
-            only_dir = top_dirs.pop()
-            # Only strip if it really is a directory wrapper (not a single file)
-            if any('/' in n for n in names):
-                strip_prefix = only_dir + '/'
+        # Only strip if it really is a directory wrapper (not a single file)
+        if len(top_dirs) == 1 and has_any_slash:
+            strip_prefix = top_dirs.pop() + '/'
 
         extracted = 0
         for info in zf.infolist():
@@ -1218,8 +1652,9 @@ def _extract_source_archive(job_workspace: Path, archive_file) -> int:
 def list_backends():
     """List available agentic backends."""
     try:
-        from src.llamaindex_crew.backends import registry
-        backends = registry.list_backends()
+        if _backend_registry is None:
+            raise ImportError("backend registry not importable")
+        backends = _backend_registry.list_backends()
         return jsonify({'backends': backends}), 200
     except Exception as e:
         print(f"Error listing backends: {e}")
@@ -1236,6 +1671,12 @@ def create_job():
     For migration projects, pass ``mode=migration`` to skip the build pipeline
     and send source files via the ``source_files``/``source_paths`` fields.
     """
+    if _job_queue_full():
+        return jsonify({
+            'error': 'Job queue is full, try again shortly',
+            'queued': _job_queue_depth(),
+        }), 429, {'Retry-After': '30'}
+
     # Support both JSON and multipart
     github_urls = []
     backend_name = 'opl-ai-team'  # default
@@ -1243,27 +1684,29 @@ def create_job():
     
     metadata = {}
     team_id = None
-    if request.content_type and 'multipart/form-data' in request.content_type:
-        vision = request.form.get('vision', '')
-        backend_name = request.form.get('backend', 'opl-ai-team')
+    content_type = request.content_type or ''
+    if 'multipart/form-data' in content_type:
+        form = request.form
+        vision = form.get('vision', '')
+        backend_name = form.get('backend', 'opl-ai-team')
         # GitHub URLs can come as repeated form fields
-        github_urls = request.form.getlist('github_urls')
-        mode = request.form.get('mode', 'build')
-        team_id = request.form.get('team_id') or None
-        raw_meta = request.form.get('metadata', '{}')
+        github_urls = form.getlist('github_urls')
+        mode = form.get('mode', 'build')
+        team_id = form.get('team_id') or None
+        raw_meta = form.get('metadata', '{}')
         try:
             metadata = json.loads(raw_meta) if raw_meta else {}
         except (json.JSONDecodeError, TypeError):
             metadata = {}
-        auto_approve_val = request.form.get('auto_approve_plan')
+        auto_approve_val = form.get('auto_approve_plan')
         if auto_approve_val is not None:
             metadata['auto_approve_plan'] = auto_approve_val.lower() == 'true'
             if metadata['auto_approve_plan']:
                 metadata['auto_approve_solution'] = True
-        target_repo_name = request.form.get('target_repo_name', '').strip()
+        target_repo_name = form.get('target_repo_name', '').strip()
         if target_repo_name:
             metadata['target_repo_name'] = target_repo_name
-        raw_cap = request.form.get('capability_profile')
+        raw_cap = form.get('capability_profile')
         if raw_cap:
             try:
                 cap = json.loads(raw_cap)
@@ -1304,10 +1747,15 @@ def create_job():
             from crew_studio.workflow_config import normalize_capability_profile_metadata
             metadata = normalize_capability_profile_metadata(metadata, None)
     
+    distinct_urls = {u.strip() for u in github_urls if u and u.strip()}
+    if len(distinct_urls) > MAX_GITHUB_URLS:
+        return jsonify({'error': f'Maximum {MAX_GITHUB_URLS} GitHub URLs per job'}), 400
+
     # Validate backend
     try:
-        from src.llamaindex_crew.backends import registry
-        backend = registry.get_backend(backend_name)
+        if _backend_registry is None:
+            raise ImportError("backend registry not importable")
+        backend = _backend_registry.get_backend(backend_name)
         if not backend:
             return jsonify({'error': f'Unknown backend: {backend_name}'}), 400
         if not backend.is_available():
@@ -1375,17 +1823,26 @@ def create_job():
             if team_to_check not in user_teams:
                 return jsonify({'error': f"User is not a member of team '{team_id}'"}), 403
 
-    # Create job record in database
-    job_db.create_job(job_id, vision, str(job_workspace), metadata=metadata,
-                      owner_id=owner_id, owner_email=owner_email, team_id=team_id)
-
-    # Save any uploaded documents (MTA reports end up here)
-    uploaded_docs = []
+    # Copy uploads (MTA reports end up here) to disk first, outside any
+    # transaction: they can be hundreds of MB and SQLite's write lock would
+    # stall every running job's progress writes for the whole copy.
+    doc_rows = []
     if request.files:
         files = request.files.getlist('documents')
         if len(files) > MAX_FILES_PER_JOB:
             files = files[:MAX_FILES_PER_JOB]
-        uploaded_docs = _save_uploaded_files(job_id, job_workspace, files)
+        doc_rows = _write_uploaded_files(job_workspace, files)
+
+    # Then the job record and its document rows in a single commit
+    try:
+        with job_db.transaction():
+            job_db.create_job(job_id, vision, str(job_workspace), metadata=metadata,
+                              owner_id=owner_id, owner_email=owner_email, team_id=team_id)
+            uploaded_docs = job_db.add_documents(job_id, doc_rows)
+    except Exception:
+        for row in doc_rows:
+            _unlink_quietly(row['stored_path'])
+        raise
 
     # ── Migration/Refactor/Import mode: extract source ZIP to workspace root, skip build ──
     source_count = 0
@@ -1402,7 +1859,16 @@ def create_job():
         else:
             print("[Migration] WARNING: request.files is empty!")
 
-    valid_urls = [u for u in github_urls if u and _is_github_url(u)]
+    # One pass: strip, validate and de-duplicate (first occurrence wins),
+    # keeping owner/repo from the same regex match for Repomix
+    match_github = GITHUB_URL_RE.match
+    github_repos: Dict[str, str] = {}
+    for raw in github_urls:
+        u = raw.strip() if raw else ''
+        m = match_github(u)
+        if m and u not in github_repos:
+            github_repos[u] = _github_repo_name(m)
+    valid_urls = list(github_repos)
 
     if mode in ('migration', 'refactor', 'import'):
         # Clone GitHub repos directly to workspace root (not packed as XML)
@@ -1461,7 +1927,7 @@ def create_job():
                         'error': str(exc),
                     })
 
-            threading.Thread(target=_auto_analyze_fix, daemon=True).start()
+            _submit_job(job_id, _auto_analyze_fix)
         return jsonify({
             'job_id': job_id,
             'status': 'queued',
@@ -1482,18 +1948,29 @@ def create_job():
         # Mark job as started so status shows "running"
         job_db.update_job(job_id, {'status': 'running'})
         
-        # Pack each GitHub repo with Repomix
-        for i, url in enumerate(valid_urls):
-            progress = 2 + (i * 3)
-            logger.info(f"Processing GitHub URL ({i+1}/{len(valid_urls)}): {url}")
-            job_db.update_progress(job_id, 'fetching_context',
-                                   progress, f"Packing reference repo with Repomix: {url}")
-            result = _run_repomix(url, job_workspace, job_id)
-            if result:
-                repomix_count += 1
-                logger.info(f"Packed {result['repo']} ({result['size']} bytes)")
-            else:
-                logger.warning(f"Failed to pack {url} – continuing without it")
+        # Pack the GitHub repos with Repomix. Each run is a separate npx
+        # process spending its time in git/network I/O, so a few run at once.
+        job_db.update_progress(job_id, 'fetching_context', 2,
+                               f"Packing {len(valid_urls)} reference repo(s) with Repomix")
+        with ThreadPoolExecutor(max_workers=min(len(valid_urls), REPOMIX_WORKERS),
+                                thread_name_prefix="repomix") as pool:
+            futures = {
+                pool.submit(_run_repomix, url, job_workspace, job_id, github_repos[url]): url
+                for url in valid_urls
+            }
+            packed_docs = []
+            for i, future in enumerate(as_completed(futures)):
+                url = futures[future]
+                result = future.result()
+                if result:
+                    repomix_count += 1
+                    packed_docs.append(result['doc'])
+                    logger.info(f"Packed {result['repo']} ({result['size']} bytes)")
+                else:
+                    logger.warning(f"Failed to pack {url} – continuing without it")
+                job_db.update_progress(job_id, 'fetching_context', 2 + (i + 1) * 3,
+                                       f"Packed reference repo {i + 1}/{len(valid_urls)}: {url}")
+        job_db.add_documents(job_id, packed_docs)
         
         if repomix_count > 0:
             logger.info(f"Successfully packed {repomix_count}/{len(valid_urls)} repos")
@@ -1510,24 +1987,14 @@ def create_job():
             run_job_async(job_id, vision, config)
 
     if valid_urls:
-        # Start combined GitHub-fetch + job thread
-        thread = threading.Thread(target=process_github_and_run)
+        # Combined GitHub-fetch + job run
+        _submit_job(job_id, process_github_and_run)
+    elif backend and backend.name != 'opl-ai-team':
+        # Use pluggable backend (e.g., Aider)
+        _submit_job(job_id, run_job_with_backend, job_id, vision, backend)
     else:
-        # Start job directly (no GitHub repos to fetch)
-        if backend and backend.name != 'opl-ai-team':
-            # Use pluggable backend (e.g., Aider)
-            thread = threading.Thread(
-                target=run_job_with_backend,
-                args=(job_id, vision, backend)
-            )
-        else:
-            # Use original OPL path (preserves all existing functionality)
-            thread = threading.Thread(
-                target=run_job_async,
-                args=(job_id, vision, config)
-            )
-    thread.daemon = True
-    thread.start()
+        # Use original OPL path (preserves all existing functionality)
+        _submit_job(job_id, run_job_async, job_id, vision, config)
     
     return jsonify({
         'job_id': job_id,
@@ -1540,7 +2007,7 @@ def create_job():
 @app.route('/api/jobs/<job_id>/documents', methods=['GET'])
 def get_job_documents(job_id):
     """List all reference documents attached to a job."""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     docs = job_db.get_job_documents(job_id)
@@ -1550,7 +2017,7 @@ def get_job_documents(job_id):
 @app.route('/api/jobs/<job_id>/documents', methods=['POST'])
 def upload_job_documents(job_id):
     """Upload additional documents to an existing job."""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
@@ -1569,28 +2036,47 @@ def upload_job_documents(job_id):
     return jsonify({'uploaded': len(saved), 'documents': saved}), 201
 
 
+# Removes files whose DB rows are already gone, off the request thread.
+_FILE_CLEANUP_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="file-cleanup")
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        Path(path).unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("Could not remove %s: %s", path, e)
+
+
 @app.route('/api/jobs/<job_id>/documents/<doc_id>', methods=['DELETE'])
 def delete_job_document(job_id, doc_id):
     """Delete a reference document from a job."""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
-    docs = job_db.get_job_documents(job_id)
-    doc = next((d for d in docs if d['id'] == doc_id), None)
+    doc = job_db.get_document(job_id, doc_id)
     if not doc:
         return jsonify({'error': 'Document not found'}), 404
     
-    # Remove file from disk
-    try:
-        Path(doc['stored_path']).unlink(missing_ok=True)
-    except Exception:
-        pass
-    
+    # The DB row is the source of truth; the file goes in the background so
+    # a slow mount can't stall the request
     job_db.delete_document(doc_id)
+    _FILE_CLEANUP_EXECUTOR.submit(_unlink_quietly, doc['stored_path'])
     return jsonify({'status': 'deleted'})
 
 
+# Job listings show a short vision preview; the full text is on the job detail.
+_LIST_VISION_CHARS = 100
+_json_compact = json.JSONEncoder(separators=(',', ':'))
+
+
+def _dumps_compact(obj):
+    """Compact JSON for streamed responses: orjson bytes when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return _json_compact.encode(obj)
+
+
 @app.route('/api/jobs', methods=['GET'])
 def list_jobs():
     """List jobs with optional pagination, filtering, and sorting.
@@ -1606,16 +2092,20 @@ def list_jobs():
     offset = (page - 1) * page_size
 
     total = job_db.get_jobs_count(vision_filter=vision_contains, status_filter=status)
-    jobs = job_db.get_jobs_paginated(
+    rows = job_db.iter_job_summaries(
         limit=page_size, offset=offset,
         vision_filter=vision_contains, status_filter=status,
         sort_by=sort_by, sort_order=sort_order,
+        vision_chars=_LIST_VISION_CHARS + 1,
     )
 
     def _summary(job):
+        vision = job['vision'] or ''
+        if len(vision) > _LIST_VISION_CHARS:
+            vision = vision[:_LIST_VISION_CHARS] + '...'
         summary = {
             'id': job['id'],
-            'vision': job['vision'],
+            'vision': vision,
             'status': job['status'],
             'progress': job['progress'],
             'current_phase': job['current_phase'],
@@ -1626,43 +2116,148 @@ def list_jobs():
             summary['metadata'] = job['metadata']
         return summary
 
-    return jsonify({
-        'jobs': [_summary(j) for j in jobs],
-        'total': total,
-        'page': page,
-        'page_size': page_size,
-    })
+    def generate():
+        # Stream one job at a time so memory stays bounded by a single row
+        yield '{"jobs":['
+        for i, job in enumerate(rows):
+            if i:
+                yield ','
+            yield _dumps_compact(_summary(job))
+        yield '],'
+        yield _dumps_compact({
+            'total': total, 'page': page, 'page_size': page_size,
+        })[1:]
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 
 @app.route('/api/jobs/<job_id>', methods=['GET'])
 def get_job(job_id):
     """Get job status and details"""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
     return jsonify(job)
 
 
+def _not_modified(etag: str) -> Optional[Response]:
+    """A 304 for ``etag`` when the client already holds it, else None."""
+    if not etag_matches(request.headers.get('If-None-Match'), etag):
+        return None
+    resp = Response(status=304)
+    resp.set_etag(etag)
+    return resp
+
+
 @app.route('/api/jobs/<job_id>/progress', methods=['GET'])
 def get_job_progress(job_id):
     """Get job progress"""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
-    
-    return jsonify({
+
+    etag = job_state_etag(job)
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+
+    resp = jsonify({
         'status': job['status'],
         'progress': job['progress'],
         'current_phase': job['current_phase'],
         'last_message': job.get('last_message', [])[-10:]  # Last 10 messages
     })
+    resp.set_etag(etag)
+    return resp
+
+
+# Upper bound on files returned by one workspace listing request.
+_FILE_LIST_MAX_LIMIT = 10000
+
+
+@functools.lru_cache(maxsize=4096)
+def _iso_mtime(mtime: float) -> str:
+    """ISO string for an mtime; files written together often share one."""
+    return datetime.fromtimestamp(mtime).isoformat()
+
+
+def _scandir_files(root, prefix: str = ''):
+    """Yield ``(rel_path, stat)`` for every file under ``root``.
+
+    One ``stat`` per file: ``os.scandir`` entries answer the type checks from
+    the directory listing itself. Symlinked directories are not descended
+    into (as with ``os.walk``); links to files report their target's stat.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            rel_path = prefix + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_files(entry.path, rel_path + os.sep)
+                    continue
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            yield rel_path, st
+
+
+def _file_listing_response(walk, **extra) -> Response:
+    """Stream a page of a workspace walk using ?limit=&offset=&sort=mtime&count=true.
+
+    ``walk`` is a callable returning a lazy iterator of ``(rel_path, stat)``.
+    Unsorted listings stop walking once the page is full; ``sort=mtime``
+    (newest first) keeps only ``offset + limit`` entries in a heap. Files are
+    written out as they are walked, followed by ``has_more``, any ``extra``
+    keys and — only when ``count=true``, since it needs a full walk — ``total``.
+    """
+    try:
+        limit = int(request.args.get('limit', _FILE_LIST_MAX_LIMIT))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        limit, offset = _FILE_LIST_MAX_LIMIT, 0
+    limit = max(1, min(limit, _FILE_LIST_MAX_LIMIT))
+    offset = max(0, offset)
+    count = request.args.get('count') == 'true'
+
+    entries = walk()
+    if request.args.get('sort') == 'mtime':
+        entries = heapq.nlargest(offset + limit + 1, entries, key=lambda e: e[1].st_mtime)
+    window = itertools.islice(entries, offset, offset + limit + 1)
+
+    def generate():
+        yield '{"files":['
+        has_more = False
+        for i, (rel_path, st) in enumerate(window):
+            if i == limit:
+                has_more = True
+                break
+            if i:
+                yield ','
+            yield _dumps_compact({
+                'path': rel_path,
+                'size': st.st_size,
+                'modified': _iso_mtime(st.st_mtime),
+            })
+        tail = {'has_more': has_more, **extra}
+        if count:
+            tail['total'] = sum(1 for _ in walk())
+        yield '],'
+        yield _dumps_compact(tail)[1:]
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 
 @app.route('/api/jobs/<job_id>/files', methods=['GET'])
 def list_job_files(job_id):
     """List files generated by job"""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
@@ -1671,38 +2266,72 @@ def list_job_files(job_id):
     if not workspace_path.exists():
         return jsonify({'files': []})
     
-    files = []
-    for file_path in workspace_path.rglob('*'):
-        if file_path.is_file():
-            rel_path = file_path.relative_to(workspace_path)
-            files.append({
-                'path': str(rel_path),
-                'size': file_path.stat().st_size,
-                'modified': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
-            })
-    
-    return jsonify({'files': files})
+    return _file_listing_response(lambda: _scandir_files(workspace_path))
+
+
+# Polling clients hit /tasks every few seconds; keep subtask counts until the
+# task DB file changes (keyed by its mtime/size signature).
+_phase_counts_cache = BoundedCache(maxsize=256)
+
+# TaskManager runs its CREATE TABLE/INDEX schema setup (a write transaction)
+# on construction, so keep one per job instead of building it on every poll.
+_task_managers = BoundedCache(maxsize=256)
+_task_managers_lock = threading.Lock()
+
+
+def _get_task_manager(job_id: str, db_path: Path):
+    """Return the cached TaskManager for ``job_id``'s task DB at ``db_path``."""
+    if TaskManager is None:
+        raise RuntimeError("task manager unavailable")
+    with _task_managers_lock:
+        tm = _task_managers.get(job_id)
+        if tm is None or tm.db_path != db_path:
+            tm = TaskManager(db_path, job_id)
+            _task_managers.set(job_id, tm)
+        return tm
+
+
+def _find_tasks_db(workspace_path: Path, job_id: str) -> Optional[Path]:
+    """Return the job's task DB: ``tasks_<job_id>.db``, else the first ``tasks_*.db``."""
+    db_path = workspace_path / f"tasks_{job_id}.db"
+    if db_path.is_file():
+        return db_path
+    try:
+        with os.scandir(workspace_path) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith('tasks_') and name.endswith('.db') and entry.is_file():
+                    return Path(entry.path)
+    except OSError:
+        pass
+    return None
+
+
+def _get_phase_counts(job_id: str, db_path: Path, db_sig: str) -> Dict[str, Dict[str, int]]:
+    """Return {phase: {total, completed, in_progress}} from the job's task DB."""
+    cached = _phase_counts_cache.get(job_id)
+    if cached and cached[0] == (db_path, db_sig):
+        return cached[1]
+
+    phase_counts: Dict[str, Dict[str, int]] = {}
+    try:
+        phase_counts = _get_task_manager(job_id, db_path).get_phase_counts()
+    except Exception as e:
+        print(f"Warning: could not read task DB: {e}")
+        return phase_counts
+
+    _phase_counts_cache.set(job_id, ((db_path, db_sig), phase_counts))
+    return phase_counts
 
 
 @app.route('/api/jobs/<job_id>/tasks', methods=['GET'])
 def get_job_tasks(job_id):
     """Return one task entry per agent/phase with progress info."""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
     workspace_path = Path(job['workspace_path'])
-    db_path = workspace_path / f"tasks_{job_id}.db"
-
-    # ── Phase metadata (matches AGENT_DEFINITIONS & workflow state machine) ──
-    PHASE_META = {
-        'meta':           {'agent': 'Meta Agent',    'description': 'Planning project approach and task breakdown'},
-        'product_owner':  {'agent': 'Product Owner', 'description': 'Defining user stories and acceptance criteria'},
-        'designer':       {'agent': 'Designer',      'description': 'Creating wireframes and design specifications'},
-        'tech_architect': {'agent': 'Tech Architect','description': 'System design and technology decisions'},
-        'development':    {'agent': 'Dev Crew',      'description': 'Implementing core application logic'},
-        'frontend':       {'agent': 'Frontend Crew', 'description': 'Building the user interface'},
-    }
 
     # ── Determine phase status from current_phase ──
     current_phase = job.get('current_phase', 'queued')
@@ -1710,39 +2339,32 @@ def get_job_tasks(job_id):
 
     if job_status == 'completed' or current_phase == 'completed':
         current_idx = len(PHASE_ORDER)
-    elif current_phase in PHASE_ORDER:
-        current_idx = PHASE_ORDER.index(current_phase)
+    elif current_phase in PHASE_INDEX:
+        current_idx = PHASE_INDEX[current_phase]
     else:
         current_idx = -1
 
-    # ── Try to read real subtask counts from SQLite ──
-    phase_counts = {}  # {phase: {total, completed, in_progress}}
-    if not db_path.exists():
-        db_files = list(workspace_path.glob('tasks_*.db'))
-        if db_files:
-            db_path = db_files[0]
-
-    if db_path.exists():
+    # ── Skip the task DB entirely when neither the job nor its DB changed ──
+    db_path = _find_tasks_db(workspace_path, job_id)
+    db_sig = ''
+    if db_path:
         try:
-            from src.llamaindex_crew.orchestrator.task_manager import TaskManager
-            task_manager = TaskManager(db_path, job_id)
-            for task in task_manager.get_all_tasks():
-                phase = task.phase
-                if phase not in phase_counts:
-                    phase_counts[phase] = {'total': 0, 'completed': 0, 'in_progress': 0}
-                phase_counts[phase]['total'] += 1
-                st = task_manager.get_task_status(task.task_id)
-                if st and st.value == 'completed':
-                    phase_counts[phase]['completed'] += 1
-                elif st and st.value == 'in_progress':
-                    phase_counts[phase]['in_progress'] += 1
-        except Exception as e:
-            print(f"Warning: could not read task DB: {e}")
+            st = db_path.stat()
+            db_sig = f"{st.st_mtime_ns}:{st.st_size}"
+        except OSError:
+            db_path = None
+    etag = job_state_etag(job, db_sig)
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+
+    # ── Try to read real subtask counts from SQLite ──
+    phase_counts = _get_phase_counts(job_id, db_path, db_sig) if db_path else {}
 
     # ── Build one task per phase ──
     tasks = []
-    for i, phase in enumerate(PHASE_ORDER):
-        meta = PHASE_META.get(phase, {'agent': phase, 'description': phase})
+    for i, template in enumerate(_PHASE_TASK_TEMPLATES):
+        phase = template['phase']
 
         if current_idx < 0:
             status = 'pending'
@@ -1759,11 +2381,7 @@ def get_job_tasks(job_id):
         progress = int((completed / total) * 100) if total > 0 else (100 if status == 'completed' else 0)
 
         tasks.append({
-            'task_id': f'phase-{phase}',
-            'phase': phase,
-            'task_type': phase.replace('_', ' ').title(),
-            'agent': meta['agent'],
-            'description': meta['description'],
+            **template,
             'status': status,
             'subtasks_total': total,
             'subtasks_completed': completed,
@@ -1771,32 +2389,31 @@ def get_job_tasks(job_id):
             'progress': progress,
         })
 
-    return jsonify({
+    resp = jsonify({
         'total_tasks': len(tasks),
         'tasks': tasks,
     })
+    resp.set_etag(etag)
+    return resp
 
 
 @app.route('/api/jobs/<job_id>/tasks/granular', methods=['GET'])
 def get_job_tasks_granular(job_id):
     """Return all granular/subtasks from SQLite DB for the job."""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
-    workspace_path = Path(job['workspace_path'])
-    db_path = workspace_path / f"tasks_{job_id}.db"
-
-    if not db_path.exists():
-        db_files = list(workspace_path.glob('tasks_*.db'))
-        if db_files:
-            db_path = db_files[0]
+    db_path = _find_tasks_db(Path(job['workspace_path']), job_id)
 
     tasks = []
-    if db_path.exists():
+    if db_path:
+        conn = None
         try:
             import sqlite3
-            conn = sqlite3.connect(db_path)
+            # Read-only: a poll never takes the workflow's write lock, and
+            # the connection is closed on every path
+            conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
             cursor = conn.cursor()
             
             # Fetch all dependencies to map them to tasks
@@ -1841,10 +2458,12 @@ def get_job_tasks_granular(job_id):
                     'metadata': meta_val,
                     'dependencies': deps_map.get(row[0], [])
                 })
-            conn.close()
         except Exception as e:
             print(f"Warning: could not read task DB for granular tasks: {e}")
             return jsonify({'error': f"Could not read task DB: {e}"}), 500
+        finally:
+            if conn is not None:
+                conn.close()
 
     return jsonify({
         'total_tasks': len(tasks),
@@ -1864,6 +2483,7 @@ AGENT_DEFINITIONS = [
 ]
 
 PHASE_ORDER = [a['phase'] for a in AGENT_DEFINITIONS]
+PHASE_INDEX = {p: i for i, p in enumerate(PHASE_ORDER)}
 
 # Refactor workflow: architect (analyze → design → plan) → executor → devops
 REFACTOR_AGENT_DEFINITIONS = [
@@ -1875,6 +2495,38 @@ REFACTOR_AGENT_DEFINITIONS = [
 ]
 
 REFACTOR_PHASE_ORDER = [a['phase'] for a in REFACTOR_AGENT_DEFINITIONS]
+REFACTOR_PHASE_INDEX = {p: i for i, p in enumerate(REFACTOR_PHASE_ORDER)}
+
+# Phase descriptions for /tasks; the agent name comes from AGENT_DEFINITIONS
+PHASE_DESCRIPTIONS = {
+    'meta':           'Planning project approach and task breakdown',
+    'product_owner':  'Defining user stories and acceptance criteria',
+    'designer':       'Creating wireframes and design specifications',
+    'tech_architect': 'System design and technology decisions',
+    'development':    'Implementing core application logic',
+    'frontend':       'Building the user interface',
+}
+
+# Static parts of the /agents and /tasks entries, built once; handlers only
+# fill in the per-request status fields.
+_AGENT_TEMPLATES = tuple(
+    {'name': d['name'], 'role': d['role'], 'model': d['model'], 'phase': d['phase']}
+    for d in AGENT_DEFINITIONS
+)
+_REFACTOR_AGENT_TEMPLATES = tuple(
+    {'name': d['name'], 'role': d['role'], 'model': d['model'], 'phase': d['phase']}
+    for d in REFACTOR_AGENT_DEFINITIONS
+)
+_PHASE_TASK_TEMPLATES = tuple(
+    {
+        'task_id': f"phase-{d['phase']}",
+        'phase': d['phase'],
+        'task_type': d['phase'].replace('_', ' ').title(),
+        'agent': d['name'],
+        'description': PHASE_DESCRIPTIONS.get(d['phase'], d['phase']),
+    }
+    for d in AGENT_DEFINITIONS
+)
 
 # Phases that indicate job is in refactor flow (roster shows refactor + devops agents)
 REFACTOR_PHASES = {'refactoring', 'analysis', 'design', 'planning', 'execution', 'devops', 'refactor_failed'}
@@ -1886,7 +2538,7 @@ def get_job_agents(job_id):
     Build jobs: meta → product_owner → designer → tech_architect → development → frontend.
     Refactor jobs: analysis → design → planning → execution → devops (shows Refactor Architect, Executor, DevOps).
     """
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
@@ -1896,23 +2548,26 @@ def get_job_agents(job_id):
 
     # Use refactor roster when job is in refactor flow
     if current_phase in REFACTOR_PHASES:
-        definitions = REFACTOR_AGENT_DEFINITIONS
-        phase_order = REFACTOR_PHASE_ORDER
+        templates = _REFACTOR_AGENT_TEMPLATES
+        phase_index = REFACTOR_PHASE_INDEX
     else:
-        definitions = AGENT_DEFINITIONS
-        phase_order = PHASE_ORDER
+        templates = _AGENT_TEMPLATES
+        phase_index = PHASE_INDEX
 
     if job_status == 'completed' or current_phase == 'completed':
-        current_idx = len(phase_order)
-    elif current_phase in phase_order:
-        current_idx = phase_order.index(current_phase)
-    elif current_phase == 'refactoring' and phase_order == REFACTOR_PHASE_ORDER:
+        current_idx = len(phase_index)
+    elif current_phase in phase_index:
+        current_idx = phase_index[current_phase]
+    elif current_phase == 'refactoring' and phase_index is REFACTOR_PHASE_INDEX:
         current_idx = 0  # Refactor just started → first agent (Analysis) working
     else:
         current_idx = -1
 
+    # Newest message per phase in one pass (later entries overwrite earlier)
+    last_by_phase = {m.get('phase'): m for m in messages}
+
     agents = []
-    for i, defn in enumerate(definitions):
+    for i, template in enumerate(templates):
         if current_idx < 0:
             status = 'idle'
         elif i < current_idx:
@@ -1922,15 +2577,11 @@ def get_job_agents(job_id):
         else:
             status = 'idle'
 
-        phase_messages = [m for m in messages if m.get('phase') == defn['phase']]
-        last_msg = phase_messages[-1] if phase_messages else None
+        last_msg = last_by_phase.get(template['phase'])
 
         agents.append({
-            'name': defn['name'],
-            'role': defn['role'],
-            'model': defn['model'],
+            **template,
             'status': status,
-            'phase': defn['phase'],
             'last_activity': last_msg['message'] if last_msg else None,
             'last_activity_at': last_msg['timestamp'] if last_msg else None,
         })
@@ -1938,17 +2589,23 @@ def get_job_agents(job_id):
     return jsonify({'agents': agents})
 
 
+@functools.cache
+def _budget_tracker():
+    """Shared tracker for budget reports; construction opens its own JobDatabase."""
+    return EnhancedBudgetTracker()
+
+
 @app.route('/api/jobs/<job_id>/budget', methods=['GET'])
 def get_job_budget(job_id):
     """Get budget report for job"""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
+    if EnhancedBudgetTracker is None:
+        return jsonify({'error': 'Could not get budget: budget tracker unavailable'}), 500
     try:
-        from src.llamaindex_crew.budget.tracker import EnhancedBudgetTracker
-        tracker = EnhancedBudgetTracker()
-        report = tracker.get_report(job_id)
+        report = _budget_tracker().get_report(job_id)
         return jsonify(report)
     except Exception as e:
         return jsonify({'error': f'Could not get budget: {str(e)}'}), 500
@@ -1957,7 +2614,7 @@ def get_job_budget(job_id):
 @app.route('/api/jobs/<job_id>/validation', methods=['GET'])
 def get_job_validation(job_id):
     """Get validation issues and summary for a job."""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     issues = job_db.get_validation_issues(job_id)
@@ -1975,7 +2632,9 @@ def get_job_validation(job_id):
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get system statistics"""
-    return jsonify(job_db.get_stats())
+    stats = job_db.get_stats()
+    stats['job_queue'] = {'workers': JOB_WORKERS, 'queued': _job_queue_depth()}
+    return jsonify(stats)
 
 
 @app.route('/api/workspace/files', methods=['GET'])
@@ -2003,18 +2662,9 @@ def list_workspace_files():
             # List files from all jobs
             job_workspace = base_workspace_path
         
-        files = []
-        if job_workspace and job_workspace.exists():
-            for root, dirs, filenames in os.walk(job_workspace):
-                for filename in filenames:
-                    file_path = Path(root) / filename
-                    rel_path = file_path.relative_to(job_workspace)
-                    files.append({
-                        'path': str(rel_path),
-                        'size': file_path.stat().st_size,
-                        'modified': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
-                    })
-        return jsonify({'files': files, 'workspace': str(job_workspace)})
+        return _file_listing_response(
+            lambda: _scandir_files(job_workspace), workspace=str(job_workspace),
+        )
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -2022,13 +2672,11 @@ def list_workspace_files():
 def _resolve_job_workspace(job_id: str, stored_path: str) -> Optional[Path]:
     """Resolve job workspace path. Tries stored path, then base_workspace_path/job-{id}."""
     p = Path(stored_path)
-    if p.is_absolute() and p.exists() and p.is_dir():
-        return p
-    if p.exists() and p.is_dir():
+    if p.is_dir():
         return p
     # Stored path may be relative to a different cwd; use canonical location
     canonical = base_workspace_path / f"job-{job_id}"
-    if canonical.exists() and canonical.is_dir():
+    if canonical.is_dir():
         return canonical
     return None
 
@@ -2041,10 +2689,128 @@ def _should_exclude_from_download(rel_path_str: str, name: str) -> bool:
     return should_exclude_from_publish(rel_path_str, name)
 
 
+# Files up to this size are mapped and handed to zlib in one call; larger ones
+# go through ZipFile.write's chunked copy to keep address space bounded.
+_ZIP_MMAP_MAX_BYTES = 32 * 1024 * 1024
+
+
+def _zip_add_file(zf: zipfile.ZipFile, full: Path, arcname: str) -> None:
+    """Add ``full`` to ``zf`` as ``arcname``, reading small files via mmap."""
+    zinfo = zipfile.ZipInfo.from_file(full, arcname)
+    if zinfo.file_size > _ZIP_MMAP_MAX_BYTES:
+        zf.write(full, arcname)
+        return
+    zinfo.compress_type = zf.compression
+    if zinfo.file_size == 0:
+        zf.writestr(zinfo, b'')
+        return
+    with open(full, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        zf.writestr(zinfo, mm)
+
+
+# Built download ZIPs, keyed by job and a signature of the files they contain.
+# Kept next to the job database rather than in the workspace so they never
+# show up in listings or the ZIP itself, and rather than in the shared /tmp
+# so other local users cannot pre-create or read the directory.
+_DOWNLOAD_CACHE_DIR = Path(os.getenv(
+    "DOWNLOAD_CACHE_DIR", str(db_path.resolve().parent / ".download-cache")
+))
+# Eviction limits: ZIPs unused for longer than this many seconds are removed,
+# then the oldest ones until the directory fits in the byte budget.
+DOWNLOAD_CACHE_MAX_AGE = float(os.getenv("DOWNLOAD_CACHE_MAX_AGE", 24 * 3600))
+DOWNLOAD_CACHE_MAX_BYTES = int(os.getenv("DOWNLOAD_CACHE_MAX_BYTES", 1024 ** 3))
+
+
+def _download_cache_dir() -> Path:
+    """Create the ZIP cache directory owner-only and refuse one we do not own."""
+    _DOWNLOAD_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = _DOWNLOAD_CACHE_DIR.lstat()
+    if not stat.S_ISDIR(st.st_mode) or (hasattr(os, 'getuid') and st.st_uid != os.getuid()):
+        raise RuntimeError(f"Refusing to use download cache {_DOWNLOAD_CACHE_DIR}: not a directory owned by this user")
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        os.chmod(_DOWNLOAD_CACHE_DIR, 0o700)
+    return _DOWNLOAD_CACHE_DIR
+
+
+def _evict_download_cache(keep: Path) -> None:
+    """Drop expired ZIPs and leftover temp files, then the oldest until under budget."""
+    now = time.time()
+    entries = []
+    for entry in _DOWNLOAD_CACHE_DIR.iterdir():
+        try:
+            st = entry.stat()
+        except FileNotFoundError:
+            continue
+        if entry != keep and now - st.st_mtime > DOWNLOAD_CACHE_MAX_AGE:
+            entry.unlink(missing_ok=True)
+        elif entry.suffix == '.zip':
+            entries.append((st.st_mtime, st.st_size, entry))
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= DOWNLOAD_CACHE_MAX_BYTES:
+            break
+        if entry != keep:
+            entry.unlink(missing_ok=True)
+            total -= size
+
+
+def _iter_download_files(workspace_path: Path):
+    """Yield ``(full_path, arcname)`` for every file that belongs in the download ZIP."""
+    workspace_resolved = workspace_path.resolve()
+    for root, dirs, filenames in os.walk(workspace_path):
+        dirs[:] = [d for d in dirs if d != '.git']
+        for name in filenames:
+            full = Path(root) / name
+            try:
+                rel = full.resolve().relative_to(workspace_resolved)
+            except ValueError:
+                continue
+            arcname = str(rel).replace('\\', '/')
+            if _should_exclude_from_download(arcname, name):
+                continue
+            yield full, arcname
+
+
+def _cached_workspace_zip(job_id: str, workspace_path: Path) -> Path:
+    """Return a ZIP of the workspace, rebuilding it only when the files changed.
+
+    The cache key hashes every included file's path, size and mtime, so a
+    repeat download of an unchanged workspace is a single walk + stat pass.
+    Older ZIPs for the same job are removed when a new one is written, and
+    the whole cache is trimmed by age and size (see _evict_download_cache).
+    """
+    files = list(_iter_download_files(workspace_path))
+    sig = hashlib.blake2b(digest_size=8)
+    for full, arcname in files:
+        st = full.stat()
+        sig.update(f"{arcname}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    cache_dir = _download_cache_dir()
+    zip_path = cache_dir / f"{job_id}-{sig.hexdigest()}.zip"
+    if zip_path.is_file():
+        # Bump the mtime so eviction treats the ZIP as recently used.
+        os.utime(zip_path)
+        return zip_path
+
+    fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh, zipfile.ZipFile(fh, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for full, arcname in files:
+                _zip_add_file(zf, full, arcname)
+        os.replace(tmp_name, zip_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    for stale in cache_dir.glob(f"{job_id}-*.zip"):
+        if stale != zip_path:
+            stale.unlink(missing_ok=True)
+    _evict_download_cache(keep=zip_path)
+    return zip_path
+
+
 @app.route('/api/jobs/<job_id>/download', methods=['GET'])
 def download_job_workspace(job_id):
     """Return the job workspace as a ZIP file for download (excludes internal agent files)."""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     workspace_path = _resolve_job_workspace(job_id, job['workspace_path'])
@@ -2056,40 +2822,31 @@ def download_job_workspace(job_id):
         refactored_dir = workspace_path / "refactored"
         if refactored_dir.is_dir():
             workspace_path = refactored_dir
-    buf = io.BytesIO()
-    workspace_resolved = workspace_path.resolve()
-    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
-        for root, dirs, filenames in os.walk(workspace_path):
-            dirs[:] = [d for d in dirs if d != '.git']
-            for name in filenames:
-                full = Path(root) / name
-                try:
-                    rel = full.resolve().relative_to(workspace_resolved)
-                except ValueError:
-                    continue
-                arcname = str(rel).replace('\\', '/')
-                if _should_exclude_from_download(arcname, name):
-                    continue
-                zf.write(full, arcname)
-    buf.seek(0)
+    zip_path = _cached_workspace_zip(job_id, workspace_path)
     safe_name = f"project-{job_id[:8]}.zip"
     try:
         return send_file(
-            buf,
+            zip_path,
             mimetype='application/zip',
             as_attachment=True,
             download_name=safe_name,
+            conditional=True,
         )
     except TypeError:
         # Flask < 2.0 used attachment_filename
         return send_file(
-            buf,
+            zip_path,
             mimetype='application/zip',
             as_attachment=True,
             attachment_filename=safe_name,
+            conditional=True,
         )
 
 
+# Largest file get_file_content will load into a JSON response (raw=1 streams).
+_FILE_CONTENT_MAX_BYTES = 10 * 1024 * 1024
+
+
 @app.route('/api/workspace/files/<path:file_path>', methods=['GET'])
 def get_file_content(file_path):
     """Get file content from workspace (supports job-specific paths)"""
@@ -2107,51 +2864,75 @@ def get_file_content(file_path):
                     refactored_dir = job_workspace / "refactored"
                     if refactored_dir.is_dir():
                         job_workspace = refactored_dir
-                        
-                full_path = job_workspace / file_path
             else:
                 # Job not found, fallback to base workspace
-                full_path = base_workspace_path / file_path
+                job_workspace = base_workspace_path
         else:
-            # Try to find file in any job workspace
-            full_path = None
-            for job in job_db.get_all_jobs():
-                job_workspace = Path(job['workspace_path'])
-                potential_path = job_workspace / file_path
-                if potential_path.exists() and potential_path.is_file():
-                    full_path = potential_path
-                    break
-            
-            if full_path is None:
-                # Fallback to base workspace
-                full_path = base_workspace_path / file_path
+            # Without a job_id, paths are relative to the base workspace (as
+            # listed by /api/workspace/files), e.g. "job-<id>/src/app.py"
+            job_workspace = base_workspace_path
         
-        if not full_path.exists() or not full_path.is_file():
-            return jsonify({'error': 'File not found'}), 404
+        # Keep ../ and symlinks from reaching outside the workspace
+        workspace_resolved = job_workspace.resolve()
+        full_path = (workspace_resolved / file_path).resolve()
+        if not full_path.is_relative_to(workspace_resolved):
+            return jsonify({'error': 'Invalid path'}), 400
         
-        with open(full_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        try:
+            # Raw bytes straight from disk (sendfile where available) for
+            # clients that ask for them; the JSON wrapper stays the default.
+            if request.args.get('raw') or request.accept_mimetypes.best == 'text/plain':
+                return send_file(full_path, mimetype='text/plain', conditional=True)
+            # Binary read + one decode: no newline translation pass, and the
+            # size check uses the open handle rather than a separate stat.
+            with open(full_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size > _FILE_CONTENT_MAX_BYTES:
+                    return jsonify({'error': 'File too large to display'}), 413
+                content = f.read().decode('utf-8')
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return jsonify({'error': 'File not found'}), 404
         
-        return jsonify({
-            'path': file_path,
-            'content': content
-        })
+        return Response(
+            _dumps_compact({'path': file_path, 'content': content}),
+            mimetype='application/json',
+        )
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+# Simple relative paths only: letters, digits, slashes, dots, spaces, hyphens, underscores.
+# The character class also rules out null bytes and backslashes.
+_SAFE_RELATIVE_PATH_RE = re.compile(r'[\w/. -]+')
+
+
 def _is_safe_relative_path(path: str) -> bool:
     """Reject path escape: no '..', no absolute path, no null bytes."""
-    if not path or path.startswith('/') or '..' in path or '\x00' in path:
+    if not path or path[0] == '/' or '..' in path:
         return False
-    # Only allow simple relative paths (letters, digits, slashes, dots, hyphens, underscores)
-    return all(c.isalnum() or c in '/._ -' for c in path)
+    return _SAFE_RELATIVE_PATH_RE.fullmatch(path) is not None
+
+
+# Dashboard polls refinement history; serve repeats from memory for a moment.
+# refine_job drops the entry when it records a new refinement, and the TTL
+# bounds how long a completion written by the runner can go unseen.
+_REFINEMENTS_TTL = 1.0
+_refinements_cache = BoundedCache(maxsize=256, ttl=_REFINEMENTS_TTL)
+
+
+class RefineRequest(BaseModel):
+    """Body of POST /api/jobs/<id>/refine; strings arrive already stripped."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    prompt: Optional[str] = None
+    file_path: Optional[str] = None
+    scope: Optional[str] = None
+    refinement_kind: Optional[str] = None
 
 
 @app.route('/api/jobs/<job_id>/refine', methods=['POST'])
 def refine_job(job_id):
     """Start a refinement run for a completed/failed job. Returns 202 or 409 if already refining."""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     if job['status'] == 'running':
@@ -2162,27 +2943,28 @@ def refine_job(job_id):
         }), 400
     if job.get('current_phase') == 'refining':
         return jsonify({'error': 'Refinement already in progress'}), 409
-    data = request.get_json() or {}
-    prompt = (data.get('prompt') or '').strip()
+    try:
+        body = RefineRequest.model_validate(request.get_json(silent=True) or {})
+    except ValidationError as e:
+        return jsonify({'error': f'Invalid request body: {e.errors()[0]["msg"]}'}), 400
+    prompt = body.prompt
     if not prompt:
         return jsonify({'error': 'prompt is required'}), 400
-    file_path = data.get('file_path')
-    if file_path is not None:
-        file_path = file_path.strip() if isinstance(file_path, str) else None
-        if file_path and not _is_safe_relative_path(file_path):
-            return jsonify({'error': 'Invalid file_path'}), 400
-    refinement_id = str(uuid.uuid4())
-    job_db.create_refinement(refinement_id, job_id, prompt, file_path)
-    # Mark job as running so dashboard shows it as running and tracks refinement progress
-    previous_status = job.get('status') or 'completed'
-    job_db.update_job(job_id, {'status': 'running'})
-    job_db.update_progress(job_id, 'refining', 0, 'Refinement started.')
-    scope = (data.get('scope') or '').strip().lower() or None
+    file_path = body.file_path
+    if file_path and not _is_safe_relative_path(file_path):
+        return jsonify({'error': 'Invalid file_path'}), 400
+    scope = body.scope.lower() if body.scope else None
     if scope and scope not in ('impact', 'file', 'project'):
         return jsonify({'error': 'scope must be impact, file, or project'}), 400
     if scope is None:
         scope = 'impact' if file_path else 'project'
-    refinement_kind = (data.get('refinement_kind') or '').strip() or None
+    refinement_kind = body.refinement_kind or None
+    refinement_id = str(uuid.uuid4())
+    previous_status = job.get('status') or 'completed'
+    # Record the refinement and mark the job running (so the dashboard tracks
+    # refinement progress) in a single commit
+    job_db.start_refinement(refinement_id, job_id, prompt, file_path)
+    _refinements_cache.pop(job_id, None)
     def progress_cb(phase: str, progress: int, message: Optional[str] = None):
         job_db.update_progress(job_id, phase, progress, message or '')
 
@@ -2208,26 +2990,29 @@ def refine_job(job_id):
             scope=scope,
             refinement_kind=refinement_kind,
         )
-    thread = threading.Thread(target=run)
-    thread.daemon = True
-    thread.start()
+    _submit_job(job_id, run)
     return jsonify({'status': 'refining', 'message': 'Refinement started', 'refinement_id': refinement_id}), 202
 
 
 @app.route('/api/jobs/<job_id>/refinements', methods=['GET'])
 def get_job_refinements(job_id):
     """List refinement history for a job."""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
-    refinements = job_db.get_refinement_history(job_id)
-    return jsonify({'refinements': refinements})
+    refinements = _refinements_cache.get(job_id)
+    if refinements is None:
+        refinements = job_db.get_refinement_history(job_id)
+        _refinements_cache.set(job_id, refinements)
+    resp = jsonify({'refinements': refinements})
+    resp.add_etag()
+    return resp.make_conditional(request)
 
 
 @app.route('/api/jobs/<job_id>/refinement/changes', methods=['GET'])
 def get_refinement_changes_route(job_id):
     """Git diffstat from first pre-refinement snapshot to HEAD (MTA File Change Log compatible)."""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
@@ -2248,7 +3033,7 @@ def get_refinement_changes_route(job_id):
 @app.route('/api/jobs/<job_id>/refinement/compare', methods=['GET'])
 def get_refinement_compare_route(job_id):
     """Original (root snapshot) vs HEAD for one path — for Monaco diff UI."""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
@@ -2269,38 +3054,65 @@ def get_refinement_compare_route(job_id):
     return jsonify(payload)
 
 
+@functools.lru_cache(maxsize=256)
+def _resolved_workspace(workspace_path: str) -> Path:
+    """Resolve a job workspace once; preview pages fetch many assets per load."""
+    return Path(workspace_path).resolve()
+
+
+# Content types for workspace preview, by lower-cased file extension.
+_PREVIEW_CONTENT_TYPES: Mapping[str, str] = MappingProxyType({
+    '.html': 'text/html', '.htm': 'text/html',
+    '.js': 'application/javascript', '.mjs': 'application/javascript',
+    '.css': 'text/css', '.json': 'application/json',
+    '.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif', '.svg': 'image/svg+xml', '.ico': 'image/x-icon',
+    '.woff': 'font/woff', '.woff2': 'font/woff2',
+})
+
+
 @app.route('/api/jobs/<job_id>/preview/<path:file_path>', methods=['GET'])
 def serve_job_preview(job_id, file_path):
     """Serve a file from the job workspace for HTML preview (correct Content-Type)."""
     # URL-decode so paths like src%2Findex.html become src/index.html
     file_path = unquote(file_path)
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     if not _is_safe_relative_path(file_path):
         return jsonify({'error': 'Invalid path'}), 400
-    workspace = Path(job['workspace_path'])
-    if not workspace.exists():
-        return jsonify({'error': 'Workspace not found'}), 404
-    full_path = (workspace / file_path).resolve()
-    workspace_resolved = workspace.resolve()
-    try:
-        full_path.relative_to(workspace_resolved)
-    except ValueError:
+    workspace_resolved = _resolved_workspace(job['workspace_path'])
+    full_path = (workspace_resolved / file_path).resolve()
+    if not full_path.is_relative_to(workspace_resolved):
         return jsonify({'error': 'Invalid path'}), 400
-    if not full_path.exists() or not full_path.is_file():
+    # One stat answers "exists", "is a regular file" and the response headers
+    # (a missing workspace lands here too).
+    try:
+        st = os.stat(full_path)
+    except OSError:
         return jsonify({'error': 'File not found'}), 404
-    ext = full_path.suffix.lower()
-    content_types = {
-        '.html': 'text/html', '.htm': 'text/html',
-        '.js': 'application/javascript', '.mjs': 'application/javascript',
-        '.css': 'text/css', '.json': 'application/json',
-        '.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg',
-        '.gif': 'image/gif', '.svg': 'image/svg+xml', '.ico': 'image/x-icon',
-        '.woff': 'font/woff', '.woff2': 'font/woff2',
-    }
-    mimetype = content_types.get(ext, 'application/octet-stream')
-    return send_from_directory(str(workspace), file_path, mimetype=mimetype)
+    if not stat.S_ISREG(st.st_mode):
+        return jsonify({'error': 'File not found'}), 404
+    mimetype = _PREVIEW_CONTENT_TYPES.get(os.path.splitext(file_path)[1].lower(), 'application/octet-stream')
+    # Hand the open file to the WSGI server's file_wrapper so servers that
+    # implement it (gunicorn, uWSGI) can sendfile() it without userland copies;
+    # others fall back to werkzeug's chunked FileWrapper.
+    f = open(full_path, 'rb')
+    resp = Response(wrap_file(request.environ, f, 65536), mimetype=mimetype, direct_passthrough=True)
+    resp.content_length = st.st_size
+    resp.last_modified = st.st_mtime
+    resp.set_etag(f"{st.st_mtime_ns:x}-{st.st_size:x}")
+    # Same policy as send_file(max_age=0): always revalidate, which the ETag
+    # makes a cheap 304 while the agent keeps rewriting workspace files.
+    resp.cache_control.no_cache = True
+    # Answer If-None-Match / If-Modified-Since with 304 and Range with 206
+    # (Content-Range is computed from the stat size, the body is seeked).
+    # An unsatisfiable Range raises 416 before the response owns the handle.
+    try:
+        return resp.make_conditional(request.environ, accept_ranges=True, complete_length=st.st_size)
+    except Exception:
+        f.close()
+        raise
 
 
 # ── Phase sets for job-type classification (restart) ─────────────────────
@@ -2316,6 +3128,142 @@ _RESTARTABLE_STATUSES = frozenset({
 })
 
 
+def _restart_migration_job(job_id: str, job: Dict[str, Any], resume: bool, retry_failed: bool):
+    """Re-run a migration job: retry failed issues, or start over if none were recorded."""
+    with job_db.transaction():
+        job_db.fail_stale_migrations(job_id)
+
+        # Determine whether we can do a targeted retry (some issues exist)
+        # or need a full re-run (no issues recorded yet).
+        summary = job_db.get_migration_summary(job_id)
+        has_issues = summary['total'] > 0
+        has_failures = summary['failed'] > 0
+
+        job_db.update_job(job_id, {
+            'status': 'running',
+            'current_phase': 'migrating',
+            'error': None,
+        })
+
+    def _mig_progress(p_phase, pct, msg):
+        job_db.update_progress(job_id, p_phase, pct, msg)
+
+    def _run_migration_thread():
+        try:
+            ws_path = job.get('workspace_path', '')
+            ws = Path(ws_path)
+            if not ws.is_dir():
+                ws = base_workspace_path / f"job-{job_id}"
+
+            if has_issues and has_failures:
+                # Retry only the failed tasks
+                from crew_studio.migration.runner import run_migration_retry
+                run_migration_retry(
+                    job_id=job_id,
+                    workspace_path=str(ws),
+                    migration_goal='Analyse the MTA report and apply all migration changes',
+                    job_db=job_db,
+                    progress_callback=_mig_progress,
+                )
+            else:
+                # Full re-run — delete old issues first to avoid duplicates
+                deleted = job_db.delete_migration_issues(job_id)
+                if deleted:
+                    logger.info("Cleaned up %d old migration issues before re-run for job %s", deleted, job_id)
+
+                from crew_studio.migration.runner import run_migration
+                report_doc = job_db.find_report_document(
+                    job_id, ('mta', 'migration', 'report', 'analysis', 'issues'),
+                )
+                report_rel = report_doc['stored_path'] if report_doc else ''
+                # Plain prefix strip; stored paths are built from the workspace path
+                report_rel = report_rel.removeprefix(os.fspath(ws) + os.sep)
+                run_migration(
+                    job_id=job_id,
+                    workspace_path=str(ws),
+                    migration_goal='Analyse the MTA report and apply all migration changes',
+                    report_path=report_rel,
+                    migration_notes=None,
+                    job_db=job_db,
+                    progress_callback=_mig_progress,
+                )
+
+            # Check for remaining failures/pending before marking completed
+            outcome = job_db.get_migration_outcome(job_id)
+            if outcome['failed']:
+                n = outcome['failed']
+                sample = outcome['first_error'] or 'Unknown'
+                job_db.update_job(job_id, {
+                    'status': 'failed',
+                    'current_phase': 'migration_failed',
+                    'error': f"{n} migration task(s) failed. Example: {sample[:400]}",
+                })
+            elif outcome['pending'] > 0:
+                job_db.update_job(job_id, {
+                    'status': 'failed',
+                    'current_phase': 'migration_failed',
+                    'error': f"{outcome['pending']} task(s) still pending — migration did not complete fully",
+                })
+            else:
+                job_db.update_job(job_id, {'status': 'completed', 'current_phase': 'completed'})
+        except Exception as e:
+            job_db.update_job(job_id, {
+                'status': 'failed',
+                'current_phase': 'migration_failed',
+                'error': str(e)[:1000],
+            })
+
+    _submit_job(job_id, _run_migration_thread)
+    retry_mode = "retry_failed" if (has_issues and has_failures) else "full"
+    return jsonify({
+        'status': 'restarted',
+        'job_type': 'migration',
+        'job_id': job_id,
+        'mode': retry_mode,
+        'failed_issues': summary['failed'],
+    }), 202
+
+
+def _restart_refactor_job(job_id: str, job: Dict[str, Any], resume: bool, retry_failed: bool):
+    """Send a refactor job back to the refactor queue."""
+    job_db.update_job(job_id, {
+        'status': 'queued',
+        'current_phase': 'awaiting_refactor',
+        'error': None,
+    })
+    return jsonify({'status': 'restarted', 'job_type': 'refactor', 'job_id': job_id}), 202
+
+
+def _restart_build_job(job_id: str, job: Dict[str, Any], resume: bool, retry_failed: bool):
+    """Queue a build job again (full, resumed, or retrying failed tasks)."""
+    vision = job.get('vision', '')
+    job_db.update_job(job_id, {
+        'status': 'queued',
+        'current_phase': 'starting',
+        'progress': 0,
+        'error': None,
+    })
+    _submit_job(job_id, run_job_async, job_id, vision, config,
+                resume=resume, retry_failed=retry_failed)
+    build_mode = (
+        'retry_failed' if retry_failed
+        else ('resume' if resume else 'full')
+    )
+    return jsonify({
+        'status': 'restarted',
+        'job_type': 'build',
+        'job_id': job_id,
+        'mode': build_mode,
+    }), 202
+
+
+# Phase -> restart handler; jobs whose phase is not listed restart as builds.
+_RESTART_HANDLERS = {
+    **dict.fromkeys(_MIGRATION_JOB_PHASES, _restart_migration_job),
+    **dict.fromkeys(_REFACTOR_JOB_PHASES, _restart_refactor_job),
+}
+
+
 @app.route('/api/jobs/<job_id>/restart', methods=['POST'])
 def restart_job(job_id):
     """Restart a failed / cancelled / quota-exhausted / partially_completed job.
@@ -2328,7 +3276,7 @@ def restart_job(job_id):
       - ``{"mode": "retry_failed"}`` — retry only failed/skipped file (+ failed feature) tasks
       - For ``partially_completed``, ``retry_failed`` is the default when mode/resume omitted
     """
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
@@ -2354,157 +3302,27 @@ def restart_job(job_id):
         # Default for partial build jobs: retry incomplete tasks only
         retry_failed = True
 
-    # ── Migration job ─────────────────────────────────────────────────────
-    if phase in _MIGRATION_JOB_PHASES or vision.startswith('[MTA]'):
-        job_db.fail_stale_migrations(job_id)
-
-        # Determine whether we can do a targeted retry (some issues exist)
-        # or need a full re-run (no issues recorded yet).
-        failed_issues = job_db.get_failed_migration_issues(job_id)
-        all_issues = job_db.get_migration_issues(job_id)
-        has_issues = len(all_issues) > 0
-        has_failures = len(failed_issues) > 0
-
-        job_db.update_job(job_id, {
-            'status': 'running',
-            'current_phase': 'migrating',
-            'error': None,
-        })
-
-        def _mig_progress(p_phase, pct, msg):
-            job_db.update_progress(job_id, p_phase, pct, msg)
-
-        def _run_migration_thread():
-            try:
-                ws_path = job.get('workspace_path', '')
-                ws = Path(ws_path)
-                if not ws.is_dir():
-                    ws = base_workspace_path / f"job-{job_id}"
-
-                if has_issues and has_failures:
-                    # Retry only the failed tasks
-                    from crew_studio.migration.runner import run_migration_retry
-                    run_migration_retry(
-                        job_id=job_id,
-                        workspace_path=str(ws),
-                        migration_goal='Analyse the MTA report and apply all migration changes',
-                        job_db=job_db,
-                        progress_callback=_mig_progress,
-                    )
-                else:
-                    # Full re-run — delete old issues first to avoid duplicates
-                    deleted = job_db.delete_migration_issues(job_id)
-                    if deleted:
-                        logger.info("Cleaned up %d old migration issues before re-run for job %s", deleted, job_id)
-
-                    from crew_studio.migration.runner import run_migration
-                    docs = job_db.get_job_documents(job_id)
-                    report_doc = None
-                    for doc in docs:
-                        name_lower = doc['original_name'].lower()
-                        if any(kw in name_lower for kw in ('mta', 'migration', 'report', 'analysis', 'issues')):
-                            report_doc = doc
-                            break
-                    if not report_doc and docs:
-                        report_doc = docs[0]
-                    report_rel = report_doc['stored_path'] if report_doc else ''
-                    try:
-                        report_rel = str(Path(report_doc['stored_path']).relative_to(ws))
-                    except (ValueError, AttributeError):
-                        pass
-                    run_migration(
-                        job_id=job_id,
-                        workspace_path=str(ws),
-                        migration_goal='Analyse the MTA report and apply all migration changes',
-                        report_path=report_rel,
-                        migration_notes=None,
-                        job_db=job_db,
-                        progress_callback=_mig_progress,
-                    )
-
-                # Check for remaining failures/pending before marking completed
-                remaining_failed = job_db.get_failed_migration_issues(job_id)
-                summary = job_db.get_migration_summary(job_id)
-                if remaining_failed:
-                    n = len(remaining_failed)
-                    sample = remaining_failed[0].get('error') or 'Unknown'
-                    job_db.update_job(job_id, {
-                        'status': 'failed',
-                        'current_phase': 'migration_failed',
-                        'error': f"{n} migration task(s) failed. Example: {sample[:400]}",
-                    })
-                elif summary.get('pending', 0) > 0:
-                    job_db.update_job(job_id, {
-                        'status': 'failed',
-                        'current_phase': 'migration_failed',
-                        'error': f"{summary['pending']} task(s) still pending — migration did not complete fully",
-                    })
-                else:
-                    job_db.update_job(job_id, {'status': 'completed', 'current_phase': 'completed'})
-            except Exception as e:
-                job_db.update_job(job_id, {
-                    'status': 'failed',
-                    'current_phase': 'migration_failed',
-                    'error': str(e)[:1000],
-                })
-
-        thread = threading.Thread(target=_run_migration_thread, daemon=True)
-        thread.start()
-        retry_mode = "retry_failed" if (has_issues and has_failures) else "full"
-        return jsonify({
-            'status': 'restarted',
-            'job_type': 'migration',
-            'job_id': job_id,
-            'mode': retry_mode,
-            'failed_issues': len(failed_issues),
-        }), 202
-
-    # ── Refactor job ──────────────────────────────────────────────────────
-    if phase in _REFACTOR_JOB_PHASES:
-        job_db.update_job(job_id, {
-            'status': 'queued',
-            'current_phase': 'awaiting_refactor',
-            'error': None,
-        })
-        return jsonify({'status': 'restarted', 'job_type': 'refactor', 'job_id': job_id}), 202
-
-    # ── Build job (default) ───────────────────────────────────────────────
-    job_db.update_job(job_id, {
-        'status': 'queued',
-        'current_phase': 'starting',
-        'progress': 0,
-        'error': None,
-    })
-    thread = threading.Thread(
-        target=run_job_async,
-        args=(job_id, vision, config),
-        kwargs={'resume': resume, 'retry_failed': retry_failed},
-        daemon=True,
-    )
-    thread.start()
-    build_mode = (
-        'retry_failed' if retry_failed
-        else ('resume' if resume else 'full')
-    )
-    return jsonify({
-        'status': 'restarted',
-        'job_type': 'build',
-        'job_id': job_id,
-        'mode': build_mode,
-    }), 202
+    handler = _RESTART_HANDLERS.get(phase, _restart_build_job)
+    # MTA jobs are migrations whatever phase they stopped in
+    if handler is not _restart_migration_job and vision.startswith('[MTA]'):
+        handler = _restart_migration_job
+    return handler(job_id, job, resume, retry_failed)
 
 
 @app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
 def cancel_job(job_id):
     """Cancel a running job"""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
-    job = job_db.get_job(job_id)
-    if job and job['status'] in ['completed', 'failed', 'cancelled']:
+    if job['status'] in ('completed', 'failed', 'cancelled'):
         return jsonify({'error': 'Job is not running'}), 400
     
+    # Drop the run if it is still waiting for a worker
+    future = _job_futures.get(job_id)
+    if future is not None:
+        future.cancel()
     job_db.mark_cancelled(job_id)
     
     return jsonify({'status': 'cancelled'})
@@ -2518,7 +3336,7 @@ def push_job_to_git(job_id):
     override the GitHub repository name. Works for any job status so the user
     can push even if a job failed or was cancelled mid-run.
     """
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
@@ -2554,7 +3372,7 @@ def push_job_to_git(job_id):
 @app.route('/api/jobs/<job_id>/logs', methods=['GET'])
 def get_job_logs(job_id):
     """Retrieve job execution logs"""
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
         
@@ -2575,7 +3393,7 @@ def get_job_logs(job_id):
 def stream_job_logs(job_id):
     """Stream job execution logs in real-time via Server-Sent Events (SSE)"""
     import time
-    job = job_db.get_job(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
         
@@ -2628,4 +3446,7 @@ if __name__ == '__main__':
     # lock that deadlocks background threads doing lazy imports (e.g. the
     # SoftwareDevWorkflow import inside run_job_async).  It also kills
     # in-flight job threads on every file change.
-    app.run(host='0.0.0.0', port=port, debug=True, use_reloader=False)
+    # The debugger wraps every request; opt in with FLASK_DEBUG=1. Deployments
+    # serve crew_studio.asgi_app under uvicorn instead of this dev server.
+    debug = os.getenv('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes')
+    app.run(host='0.0.0.0', port=port, debug=debug, use_reloader=False, threaded=True)
@@ -10,6 +10,8 @@ from pathlib import Path
 
 from flask import Blueprint, request, jsonify, current_app
 
+from crew_studio.bounded_cache import BoundedCache
+
 try:
     import git as gitpython
 except ImportError:
@@ -54,20 +56,11 @@ def start_migration(job_id: str):
     migration_goal = data.get("migration_goal", "").strip() or "Analyse the MTA report and apply all migration changes"
     migration_notes = data.get("migration_notes", "").strip() or None
 
-    # Find MTA report in uploaded docs
-    docs = job_db.get_job_documents(job_id)
-    if not docs:
-        return jsonify({"error": "No documents uploaded. Please upload the MTA report first."}), 400
-
-    # Use the first uploaded doc as the MTA report (or find one with 'mta' in name)
-    report_doc = None
-    for doc in docs:
-        name_lower = doc["original_name"].lower()
-        if any(kw in name_lower for kw in ("mta", "migration", "report", "analysis")):
-            report_doc = doc
-            break
+    # Find MTA report in uploaded docs: first one with 'mta' etc. in its name,
+    # otherwise the first uploaded doc
+    report_doc = job_db.find_report_document(job_id, ("mta", "migration", "report", "analysis"))
     if not report_doc:
-        report_doc = docs[0]  # Fallback to first doc
+        return jsonify({"error": "No documents uploaded. Please upload the MTA report first."}), 400
 
     # Resolve workspace
     workspace_path = job.get("workspace_path", "")
@@ -105,10 +98,10 @@ def start_migration(job_id: str):
                 progress_callback=_progress_callback,
             )
             # If any migration issues failed, mark job as failed so it's clear something went wrong
-            failed = job_db.get_failed_migration_issues(job_id)
-            if failed:
-                failed_count = len(failed)
-                sample_error = failed[0].get("error") or "Unknown"
+            outcome = job_db.get_migration_outcome(job_id)
+            if outcome["failed"]:
+                failed_count = outcome["failed"]
+                sample_error = outcome["first_error"] or "Unknown"
                 job_db.update_job(job_id, {
                     "status": "failed",
                     "current_phase": "migration_failed",
@@ -204,39 +197,29 @@ def get_migration_changes(job_id: str):
         return jsonify({"error": "No git history in workspace"}), 404
 
     try:
-        repo = gitpython.Repo(ws)
-        commits = list(repo.iter_commits())
-
-        # Find the "pre-migration snapshot" commit
-        pre_commit = None
-        for c in commits:
-            if "pre-migration" in c.message.lower():
-                pre_commit = c
-                break
+        git = gitpython.Repo(ws).git
+        head_sha = git.rev_parse("HEAD")
+        pre_sha = _find_baseline(git, (job_id, str(ws)), head_sha)
 
-        if not pre_commit:
-            # Fallback: use the very first commit as the baseline
-            pre_commit = commits[-1] if commits else None
-
-        if not pre_commit:
+        if not pre_sha:
             return jsonify({"error": "No baseline commit found"}), 404
 
-        # Diff from pre-migration to HEAD
-        head_commit = repo.head.commit
-        diff_index = pre_commit.diff(head_commit, create_patch=False)
+        # Diff from pre-migration to HEAD: change types from --name-status,
+        # line counts from --numstat (-z keeps renamed paths unquoted)
+        change_types = _parse_name_status(
+            git.diff(pre_sha, head_sha, "-M", "--name-status", "-z")
+        )
+        line_counts = _parse_numstat(
+            git.diff(pre_sha, head_sha, "-M", "--numstat", "-z")
+        )
 
         files_changed = []
         total_insertions = 0
         total_deletions = 0
-
-        for diff_item in diff_index:
-            file_path = diff_item.b_path or diff_item.a_path
-            change_type = diff_item.change_type  # A, M, D, R, etc.
-
-            # Get per-file stats via numstat
-            insertions = 0
-            deletions = 0
-
+        for file_path, change_type in change_types.items():
+            insertions, deletions = line_counts.get(file_path, (0, 0))
+            total_insertions += insertions
+            total_deletions += deletions
             files_changed.append({
                 "path": file_path,
                 "change_type": change_type,
@@ -244,36 +227,10 @@ def get_migration_changes(job_id: str):
                 "deletions": deletions,
             })
 
-        # Use git diff --stat for accurate line counts
-        try:
-            stat_output = repo.git.diff(
-                pre_commit.hexsha, head_commit.hexsha, stat=True, numstat=True
-            )
-            # numstat format: insertions\tdeletions\tfilepath
-            stat_lookup = {}
-            for line in stat_output.strip().split("\n"):
-                parts = line.split("\t")
-                if len(parts) == 3:
-                    try:
-                        ins = int(parts[0]) if parts[0] != "-" else 0
-                        dels = int(parts[1]) if parts[1] != "-" else 0
-                        stat_lookup[parts[2]] = (ins, dels)
-                    except ValueError:
-                        pass
-
-            # Merge stats into files list
-            for f in files_changed:
-                if f["path"] in stat_lookup:
-                    f["insertions"], f["deletions"] = stat_lookup[f["path"]]
-                total_insertions += f["insertions"]
-                total_deletions += f["deletions"]
-        except Exception as e:
-            logger.warning("Failed to get numstat: %s", e)
-
         return jsonify({
             "job_id": job_id,
-            "baseline_commit": pre_commit.hexsha[:7],
-            "head_commit": head_commit.hexsha[:7],
+            "baseline_commit": pre_sha[:7],
+            "head_commit": head_sha[:7],
             "total_files": len(files_changed),
             "total_insertions": total_insertions,
             "total_deletions": total_deletions,
@@ -283,3 +240,74 @@ def get_migration_changes(job_id: str):
     except Exception as e:
         logger.error("Failed to compute migration changes: %s", e)
         return jsonify({"error": f"Failed to compute changes: {e}"}), 500
+
+
+# (job_id, workspace) -> (head_sha, baseline_sha) from the last changes request.
+# Re-running a migration adds a newer snapshot, so only commits made since the
+# cached HEAD are searched for one.
+_baseline_cache = BoundedCache(maxsize=512)
+
+
+def _find_baseline(git, key: tuple, head_sha: str) -> str:
+    """Hash of the newest "pre-migration" commit, else the root commit ("" if none)."""
+    cached = _baseline_cache.get(key)
+    if cached is not None and cached[0] == head_sha:
+        return cached[1]
+
+    rev_range = head_sha
+    if cached is not None:
+        try:
+            git.merge_base("--is-ancestor", cached[0], head_sha)
+            rev_range = f"{cached[0]}..{head_sha}"
+        except Exception:
+            cached = None  # history was rewritten; search it all again
+
+    # Hashes only, no commit objects
+    pre_sha = git.log("-i", "--grep=pre-migration", "-n", "1", "--format=%H", rev_range)
+    if not pre_sha and cached is not None:
+        pre_sha = cached[1]
+    if not pre_sha:
+        # Fallback: use the very first commit as the baseline
+        roots = git.rev_list("--max-parents=0", head_sha).split()
+        pre_sha = roots[-1] if roots else ""
+
+    _baseline_cache.set(key, (head_sha, pre_sha))
+    return pre_sha
+
+
+def _parse_name_status(output: str) -> dict:
+    """``git diff --name-status -z`` -> {path: change type letter}.
+
+    Renames and copies report their new path, like GitPython's ``b_path``.
+    """
+    parts = output.split("\0")
+    changes = {}
+    i = 0
+    while i < len(parts) and parts[i]:
+        status = parts[i]
+        if status[0] in "RC":
+            changes[parts[i + 2]] = status[0]
+            i += 3
+        else:
+            changes[parts[i + 1]] = status[0]
+            i += 2
+    return changes
+
+
+def _parse_numstat(output: str) -> dict:
+    """``git diff --numstat -z`` -> {path: (insertions, deletions)}; binary files count 0."""
+    parts = output.split("\0")
+    counts = {}
+    i = 0
+    while i < len(parts) and parts[i]:
+        ins, dels, path = parts[i].split("\t", 2)
+        i += 1
+        if not path:
+            # Rename/copy: the old and new paths follow as separate fields
+            path = parts[i + 1]
+            i += 2
+        counts[path] = (
+            int(ins) if ins != "-" else 0,
+            int(dels) if dels != "-" else 0,
+        )
+    return counts
@@ -2,12 +2,19 @@
 Deterministic MTA report parser.
 
 Converts MTA issues.json into DB-ready issue records without LLM calls.
-Designed to fit in memory and handle reports up to ~10MB.
+Designed to fit in memory and handle reports up to ~10MB; with ijson
+installed, reports are streamed one application at a time.
 """
+import itertools
 import json
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
+
+try:
+    import ijson
+except ImportError:  # optional: fall back to loading the whole report
+    ijson = None
 
 logger = logging.getLogger(__name__)
 
@@ -29,21 +36,45 @@ CATEGORY_TO_SEVERITY = {
 }
 
 
+def _iter_applications(report_path: Path) -> Iterator[Any]:
+    """Yield the elements of the top-level array in ``report_path``.
+
+    Streams with ijson when it is installed, so only one application's
+    issues are in memory at a time. Raises ValueError if the document is
+    not an array or is not valid JSON.
+    """
+    if ijson is None:
+        with open(report_path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError("Expected MTA issues.json to be an array")
+        yield from data
+        return
+
+    with open(report_path, "rb", buffering=65536) as f:
+        try:
+            events = ijson.parse(f, use_float=True)
+            first = next(events, None)
+            if first != ("", "start_array", None):
+                raise ValueError("Expected MTA issues.json to be an array")
+            yield from ijson.items(itertools.chain([first], events), "item")
+        except ijson.JSONError as e:
+            raise ValueError(f"Invalid MTA issues.json: {e}") from e
+
+
 def is_mta_issues_json(report_path: Path) -> bool:
     """Check if a file is an MTA issues.json (array of {applicationId, issues})."""
     if not report_path.is_file():
         return False
     
     try:
-        with open(report_path, encoding="utf-8") as f:
-            data = json.load(f)
-        
-        # MTA issues.json is an array of objects with applicationId and issues
-        if not isinstance(data, list) or len(data) == 0:
-            return False
-        
-        # Check first element
-        first = data[0]
+        # MTA issues.json is an array of objects with applicationId and issues;
+        # only the first element is read
+        applications = _iter_applications(report_path)
+        try:
+            first = next(applications, None)
+        finally:
+            applications.close()
         return isinstance(first, dict) and "applicationId" in first and "issues" in first
     
     except (json.JSONDecodeError, ValueError, KeyError, IOError):
@@ -97,11 +128,7 @@ def parse_mta_issues_json(
     Deduplicates by ruleId (MTA duplicates issues across applicationIds).
     Skips 'information' category issues (not actionable).
     """
-    with open(report_path, encoding="utf-8") as f:
-        data = json.load(f)
-    
-    if not isinstance(data, list):
-        raise ValueError("Expected MTA issues.json to be an array")
+    applications = _iter_applications(report_path)
     
     # Optional: load files.json for path resolution
     # Normalize paths: MTA often uses "app/" prefix; workspace may have files at root
@@ -123,7 +150,7 @@ def parse_mta_issues_json(
     # Collect all issues, keyed by ruleId for deduplication
     seen_rules: Dict[str, Dict[str, Any]] = {}
     
-    for app in data:
+    for app in applications:
         if not isinstance(app, dict) or "issues" not in app:
             continue
         
@@ -23,6 +23,12 @@ TEXT_TYPES = frozenset({
 })
 
 
+def _read_capped(path: Path, max_chars: int) -> str:
+    """Read at most ``max_chars`` characters without loading the rest of the file."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read(max_chars)
+
+
 def _prompt_limits(config: Any) -> Any:
     return getattr(config, "prompt_limits", None) if config else None
 
@@ -137,15 +143,26 @@ def build_pipeline_vision(
     doc_parts: List[str] = []
     repo_parts: List[str] = []
 
+    # Documents are emitted before repositories, so read them in that order.
+    # Text past max_enriched is cut below, so each read stops at what can
+    # still survive (content offsets only grow once headers are added).
+    entries = []
     for doc in uploaded_docs:
         doc_path = Path(doc.get("stored_path", ""))
         file_type = (doc.get("file_type") or "").lower()
-        if not doc_path.is_file() or file_type not in TEXT_TYPES:
+        if file_type not in TEXT_TYPES:
             continue
+        is_repomix = (doc.get("original_name") or "").startswith("github:")
+        entries.append((is_repomix, doc_path, doc))
+    entries.sort(key=lambda entry: entry[0])
+
+    remaining = max_enriched - len(enriched)
+    for is_repomix, doc_path, doc in entries:
         try:
-            is_repomix = (doc.get("original_name") or "").startswith("github:")
             max_chars = max_ref_repomix if is_repomix else max_ref_doc
-            content = doc_path.read_text(encoding="utf-8", errors="replace")[:max_chars]
+            # +1 keeps the total over the limit so the truncation marker is added
+            content = _read_capped(doc_path, min(max_chars, max(remaining + 1, 0)))
+            remaining -= len(content)
             original = doc.get("original_name") or doc_path.name
             if is_repomix:
                 repo_parts.append(
@@ -153,6 +170,10 @@ def build_pipeline_vision(
                 )
             else:
                 doc_parts.append(f"--- Reference: {original} ---\n{content}")
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            # Missing or not a regular file: skipped silently, as is_file() did,
+            # without a separate stat before the open
+            continue
         except OSError as e:
             logger.warning("Could not read doc for inline fallback: %s", e)
 
@@ -167,10 +188,10 @@ def build_pipeline_vision(
             + "\n\n".join(repo_parts)
         )
     if sections:
-        enriched = enriched + "\n\n" + "\n\n".join(sections)
+        enriched = "\n\n".join([enriched, *sections])
         if len(enriched) > max_enriched:
             logger.warning(
-                "Inline enriched vision truncated from %d to %d chars (max_enriched_vision_chars)",
+                "Inline enriched vision truncated from at least %d to %d chars (max_enriched_vision_chars)",
                 len(enriched), max_enriched,
             )
             enriched = enriched[:max_enriched] + "\n\n[... reference truncated — enable RAG indexing ...]"
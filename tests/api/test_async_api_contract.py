@@ -167,7 +167,7 @@ async def test_concurrent_job_reads(asgi_client):
 # ---------------------------------------------------------------------------
 
 class TestFlaskJobDispatchReturnsQuickly:
-    """The current Flask app already uses threading.Thread for job dispatch.
+    """The Flask app dispatches jobs to its background job pool.
     This test ensures that behavior is preserved as a regression gate."""
 
     @pytest.fixture(autouse=True)
@@ -189,12 +189,9 @@ class TestFlaskJobDispatchReturnsQuickly:
         except ImportError as e:
             pytest.skip(f"Flask app dependencies not available: {e}")
 
-    @patch("crew_studio.llamaindex_web_app.threading.Thread")
-    def test_flask_post_returns_201_immediately(self, mock_thread):
-        """POST /api/jobs must return 201 and dispatch the job to a thread."""
-        mock_thread_instance = MagicMock()
-        mock_thread.return_value = mock_thread_instance
-
+    @patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR")
+    def test_flask_post_returns_201_immediately(self, mock_executor):
+        """POST /api/jobs must return 201 and dispatch the job to the job pool."""
         t0 = time.monotonic()
         resp = self.client.post(
             "/api/jobs",
@@ -205,6 +202,6 @@ class TestFlaskJobDispatchReturnsQuickly:
         assert resp.status_code == 201, f"Expected 201, got {resp.status_code}: {resp.data}"
         assert elapsed < MAX_POST_LATENCY_SECS, (
             f"POST /api/jobs took {elapsed:.2f}s — it should return immediately "
-            "since job is dispatched to a thread."
+            "since job is dispatched to the job pool."
         )
-        mock_thread_instance.start.assert_called_once()
+        mock_executor.submit.assert_called_once()
@@ -0,0 +1,37 @@
+"""
+BoundedCache: the LRU/TTL map behind the polling caches.
+"""
+import sys
+import time
+from pathlib import Path
+
+root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(root))
+
+from crew_studio.bounded_cache import BoundedCache
+
+
+class TestBoundedCache:
+    def test_evicts_least_recently_used(self):
+        cache = BoundedCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_entries_expire_after_ttl(self):
+        cache = BoundedCache(maxsize=4, ttl=0.05)
+        cache.set("a", [])
+        assert cache.get("a") == []
+        time.sleep(0.1)
+        assert cache.get("a") is None
+
+    def test_pop(self):
+        cache = BoundedCache(maxsize=4)
+        cache.set("a", 1)
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
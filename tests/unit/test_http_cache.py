@@ -0,0 +1,37 @@
+"""
+Shared conditional-GET helpers used by both the Flask and FastAPI progress routes.
+"""
+import sys
+from pathlib import Path
+
+root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(root))
+
+from crew_studio.http_cache import etag_matches, job_state_etag
+
+JOB = {"status": "running", "progress": 40, "current_phase": "development",
+       "last_message": [{"message": "writing"}]}
+
+
+class TestJobStateEtag:
+    def test_stable_for_same_state(self):
+        assert job_state_etag(dict(JOB)) == job_state_etag(dict(JOB))
+
+    def test_changes_with_progress_and_extra(self):
+        tag = job_state_etag(JOB)
+        assert job_state_etag({**JOB, "progress": 41}) != tag
+        assert job_state_etag(JOB, "sig") != tag
+
+
+class TestEtagMatches:
+    def test_exact_and_list_and_weak(self):
+        tag = job_state_etag(JOB)
+        assert etag_matches(f'"{tag}"', tag)
+        assert etag_matches(f'"other", W/"{tag}"', tag)
+        assert etag_matches("*", tag)
+
+    def test_no_substring_match(self):
+        tag = job_state_etag(JOB)
+        assert not etag_matches(f'"{tag}xx"', tag)
+        assert not etag_matches(tag[:8], tag)
+        assert not etag_matches(None, tag)
@@ -0,0 +1,112 @@
+"""
+Cooperative job cancellation.
+
+cancel_job only flips the job row to 'cancelled'; the running workflow
+notices at its next progress report, which raises WorkflowCancelled so no
+further agent steps run. Live jobs keep reporting as before.
+"""
+import sys
+import threading
+import uuid
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(root))
+sys.path.insert(0, str(root / "agent"))
+sys.path.insert(0, str(root / "agent" / "src"))
+
+from crew_studio.job_database import JobDatabase
+
+
+@pytest.fixture
+def job_db(tmp_path):
+    return JobDatabase(tmp_path / "test.db")
+
+
+@pytest.fixture
+def job_id(job_db):
+    jid = str(uuid.uuid4())
+    job_db.create_job(jid, "Build a REST API", f"/tmp/ws/job-{jid}")
+    job_db.mark_started(jid)
+    return jid
+
+
+class TestProgressCallbackCancellation:
+    def test_running_job_reports_normally(self, job_db, job_id):
+        from crew_studio.llamaindex_web_app import _throttled_progress_callback
+
+        with patch("crew_studio.llamaindex_web_app.job_db", job_db):
+            _throttled_progress_callback(job_id)("meta", 10, "Starting Meta phase...")
+
+        assert job_db.get_job(job_id)["progress"] == 10
+
+    def test_cancelled_job_raises_workflow_cancelled(self, job_db, job_id):
+        from crew_studio.llamaindex_web_app import _throttled_progress_callback
+        from src.llamaindex_crew.workflows.software_dev_workflow import WorkflowCancelled
+
+        job_db.mark_cancelled(job_id)
+        with patch("crew_studio.llamaindex_web_app.job_db", job_db):
+            with pytest.raises(WorkflowCancelled):
+                _throttled_progress_callback(job_id)("development", 60, "Writing code...")
+
+        assert job_db.get_job(job_id)["status"] == "cancelled"
+
+    def test_completed_job_does_not_raise(self, job_db, job_id):
+        from crew_studio.llamaindex_web_app import _throttled_progress_callback
+
+        job_db.mark_completed(job_id, {"output": "done"})
+        with patch("crew_studio.llamaindex_web_app.job_db", job_db):
+            _throttled_progress_callback(job_id)("development", 60, "late message")
+
+        assert job_db.get_job(job_id)["status"] == "completed"
+
+
+def _bare_workflow(tmp_path, progress_callback):
+    """SoftwareDevWorkflow with only the fields the phases below touch."""
+    from src.llamaindex_crew.workflows.software_dev_workflow import SoftwareDevWorkflow
+
+    wf = object.__new__(SoftwareDevWorkflow)
+    wf.workspace_path = tmp_path
+    wf.config = None
+    wf.progress_callback = progress_callback
+    return wf
+
+
+class TestWorkflowUnwindsOnCancel:
+    def test_parallel_generation_stops_and_reraises(self, job_db, job_id, tmp_path):
+        from crew_studio.llamaindex_web_app import _throttled_progress_callback
+        from src.llamaindex_crew.workflows.software_dev_workflow import WorkflowCancelled
+
+        job_db.mark_cancelled(job_id)
+        with patch("crew_studio.llamaindex_web_app.job_db", job_db):
+            wf = _bare_workflow(tmp_path, _throttled_progress_callback(job_id))
+            wf.task_manager = MagicMock()
+            wf.task_manager.get_and_claim_actionable_task.return_value = {"task_id": "t"}
+            wf._set_dev_phase_allowlist = lambda *a: None
+
+            def process(task, agent, label, *rest):
+                wf._report_progress("development", 60, f"Generated {task['task_id']}")
+
+            wf._process_claimed_task = process
+            with pytest.raises(WorkflowCancelled):
+                wf._process_file_tasks_parallel(
+                    MagicMock, {"t"}, "dev", {}, {}, threading.Lock(), num_workers=2,
+                )
+
+        # Each worker stops at its first report instead of draining the queue
+        assert wf.task_manager.get_and_claim_actionable_task.call_count <= 2
+
+    def test_phase_retry_does_not_retry_cancel(self, tmp_path):
+        from src.llamaindex_crew.workflows.software_dev_workflow import WorkflowCancelled
+
+        wf = _bare_workflow(tmp_path, None)
+        phase = MagicMock(side_effect=WorkflowCancelled("Job 503-abc was cancelled"))
+        with patch("src.llamaindex_crew.workflows.software_dev_workflow.time.sleep") as sleep:
+            with pytest.raises(WorkflowCancelled):
+                wf._run_phase_with_retry("development", phase)
+
+        assert phase.call_count == 1
+        sleep.assert_not_called()
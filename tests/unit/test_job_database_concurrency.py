@@ -197,3 +197,84 @@ class TestLastMessageJsonIntegrity:
         assert isinstance(messages, list), (
             f"last_message should be a list, got {type(messages)}: {str(messages)[:200]}"
         )
+
+
+# ---------------------------------------------------------------------------
+# Test 4: Connections are opened once per thread and never shared
+# ---------------------------------------------------------------------------
+
+class TestPerThreadConnections:
+    """Each thread keeps one tuned connection; threads never share one."""
+
+    def test_connection_reused_within_thread_not_across(self, db, job_id):
+        with db._get_conn() as first:
+            pass
+        db.get_job(job_id)
+        with db._get_conn() as second:
+            assert second is first
+            assert second.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+        other = []
+
+        def grab():
+            with db._get_conn() as conn:
+                other.append(conn)
+
+        t = threading.Thread(target=grab)
+        t.start()
+        t.join(timeout=5)
+        assert other and other[0] is not first
+
+
+# ---------------------------------------------------------------------------
+# Test 5: Progress polls read only the message tail
+# ---------------------------------------------------------------------------
+
+class TestGetJobProgress:
+    """get_job_progress returns progress fields and the newest messages only."""
+
+    def test_returns_tail_in_order(self, db, job_id):
+        for i in range(15):
+            db.update_progress(job_id, "development", i, f"step {i}")
+
+        progress = db.get_job_progress(job_id)
+        assert progress["status"] == "running"
+        assert progress["progress"] == 14
+        assert progress["current_phase"] == "development"
+        assert [m["message"] for m in progress["last_message"]] == [f"step {i}" for i in range(5, 15)]
+        assert "vision" not in progress
+
+    def test_missing_job(self, db):
+        assert db.get_job_progress("nope") is None
+
+
+# ---------------------------------------------------------------------------
+# Test 6: Percent-only ticks keep the terminal-status guard
+# ---------------------------------------------------------------------------
+
+class TestProgressOnlyUpdates:
+    """update_progress without a message writes phase/progress only."""
+
+    def test_updates_without_touching_messages(self, db, job_id):
+        db.update_progress(job_id, "development", 10, "started")
+        assert db.update_progress(job_id, "development", 40) is True
+
+        job = db.get_job(job_id)
+        assert job["progress"] == 40
+        assert [m["message"] for m in job["last_message"]] == ["started"]
+
+    def test_refused_after_terminal_status(self, db, job_id):
+        db.mark_completed(job_id, {"output": "done"})
+        assert db.update_progress(job_id, "development", 40) is False
+        assert db.get_job(job_id)["progress"] == 100
+
+    def test_missing_job(self, db):
+        assert db.update_progress("nope", "development", 40) is False
+
+    def test_message_write_reports_success(self, db, job_id):
+        assert db.update_progress(job_id, "development", 20, "writing") is True
+        assert db.get_job(job_id)["progress"] == 20
+
+    def test_message_write_refused_after_terminal_status(self, db, job_id):
+        db.mark_cancelled(job_id)
+        assert db.update_progress(job_id, "development", 20, "late") is False
@@ -0,0 +1,96 @@
+"""
+JobDatabase.transaction() and the multi-write helpers built on it.
+
+Contract:
+  1. Calls inside ``transaction()`` commit together, or not at all on error.
+  2. ``start_refinement`` records the refinement and flips the job to
+     running/refining in one go, even from a terminal status.
+  3. ``add_documents`` records a batch of documents with one commit.
+"""
+
+import uuid
+
+import pytest
+
+from crew_studio.job_database import JobDatabase
+
+
+@pytest.fixture
+def db(tmp_path) -> JobDatabase:
+    return JobDatabase(tmp_path / "test_tx.db")
+
+
+def _job(db, status="completed") -> str:
+    jid = str(uuid.uuid4())
+    db.create_job(jid, "tx test", f"/tmp/job-{jid}")
+    db.update_job(jid, {"status": status})
+    return jid
+
+
+class TestTransaction:
+    def test_writes_commit_together(self, db):
+        jid = str(uuid.uuid4())
+        with db.transaction():
+            db.create_job(jid, "tx test", "/tmp/ws")
+            db.add_document("doc-1", jid, "a.md", "a.md", "md", 1, "/tmp/ws/a.md")
+        assert db.get_job(jid) is not None
+        assert len(db.get_job_documents(jid)) == 1
+
+    def test_error_rolls_back_every_write(self, db):
+        jid = str(uuid.uuid4())
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.create_job(jid, "tx test", "/tmp/ws")
+                raise RuntimeError("boom")
+        assert db.get_job(jid) is None
+
+    def test_nested_blocks_join_outer(self, db):
+        jid = _job(db)
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                with db.transaction():
+                    db.update_job(jid, {"status": "running"})
+                raise RuntimeError("boom")
+        assert db.get_job(jid)["status"] == "completed"
+
+
+class TestStartRefinement:
+    def test_marks_job_running_and_refining(self, db):
+        jid = _job(db, "completed")
+        ref = db.start_refinement("ref-1", jid, "Add comments", "src/app.py")
+
+        assert ref["status"] == "running"
+        job = db.get_job(jid)
+        assert job["status"] == "running"
+        assert job["current_phase"] == "refining"
+        assert job["progress"] == 0
+        assert job["last_message"][-1]["message"] == "Refinement started."
+        assert db.get_running_refinement(jid)["id"] == "ref-1"
+
+
+class TestAddDocuments:
+    def test_records_every_row_for_the_job(self, db):
+        jid = _job(db)
+        rows = [
+            {"id": f"doc-{i}", "filename": f"{i}.md", "original_name": f"{i}.md",
+             "file_type": "md", "file_size": i, "stored_path": f"/tmp/ws/{i}.md"}
+            for i in range(3)
+        ]
+        saved = db.add_documents(jid, rows)
+
+        assert [d["id"] for d in saved] == ["doc-0", "doc-1", "doc-2"]
+        assert all(d["job_id"] == jid and d["uploaded_at"] for d in saved)
+        assert {d["id"] for d in db.get_job_documents(jid)} == {"doc-0", "doc-1", "doc-2"}
+
+    def test_empty_batch_is_a_no_op(self, db):
+        jid = _job(db)
+        assert db.add_documents(jid, []) == []
+        assert db.get_job_documents(jid) == []
+
+    def test_get_document_is_scoped_to_its_job(self, db):
+        jid, other = _job(db), _job(db)
+        db.add_documents(jid, [{"id": "doc-x", "filename": "x.md", "original_name": "x.md",
+                                "file_type": "md", "file_size": 1, "stored_path": "/tmp/ws/x.md"}])
+
+        assert db.get_document(jid, "doc-x")["stored_path"] == "/tmp/ws/x.md"
+        assert db.get_document(other, "doc-x") is None
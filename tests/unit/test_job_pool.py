@@ -0,0 +1,37 @@
+"""
+The shared job pool's queued count, which drives JOB_QUEUE_MAX backpressure.
+"""
+import sys
+import threading
+from pathlib import Path
+
+root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(root))
+sys.path.insert(0, str(root / "agent"))
+sys.path.insert(0, str(root / "agent" / "src"))
+
+
+class TestDaemonJobPoolQueued:
+    def test_cancelled_jobs_leave_the_count(self):
+        from crew_studio.llamaindex_web_app import _DaemonJobPool
+
+        pool = _DaemonJobPool(max_workers=1, thread_name_prefix="test-pool")
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        running = pool.submit(block)
+        assert started.wait(5)
+        waiting = pool.submit(lambda: "ran")
+        cancelled = pool.submit(lambda: "never")
+        assert pool.queued == 2
+
+        assert cancelled.cancel()
+        assert pool.queued == 1
+
+        release.set()
+        running.result(timeout=5)
+        assert waiting.result(timeout=5) == "ran"
+        assert pool.queued == 0
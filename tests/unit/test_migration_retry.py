@@ -75,6 +75,27 @@ class TestGetFailedMigrationIssues:
         assert failed == []
 
 
+class TestGetMigrationOutcome:
+    def test_counts_failed_and_pending_with_first_error(self, tmp_path):
+        job_db = _make_db(tmp_path)
+        job_id = _create_job(job_db, "running", "migrating", "[MTA] test.zip")
+        _add_issue(job_db, job_id, "completed", "Done")
+        _add_issue(job_db, job_id, "pending", "Queued")
+        first = _add_issue(job_db, job_id, "pending", "First failure")
+        job_db.update_migration_issue_status(first, "failed", error="boom")
+        _add_issue(job_db, job_id, "failed", "Second failure")
+
+        outcome = job_db.get_migration_outcome(job_id)
+        assert outcome == {"failed": 2, "pending": 1, "first_error": "boom"}
+
+    def test_empty_job(self, tmp_path):
+        job_db = _make_db(tmp_path)
+        job_id = _create_job(job_db, "running", "migrating", "[MTA] test.zip")
+
+        outcome = job_db.get_migration_outcome(job_id)
+        assert outcome == {"failed": 0, "pending": 0, "first_error": None}
+
+
 class TestResetMigrationIssuesForRetry:
     def test_resets_failed_to_pending(self, tmp_path):
         job_db = _make_db(tmp_path)
@@ -151,8 +172,7 @@ class TestRestartEndpointRetrysMigration:
         from crew_studio.llamaindex_web_app import app
         with app.test_client() as client:
             with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
-                 patch("crew_studio.llamaindex_web_app.threading.Thread") as MockThread:
-                MockThread.return_value.start = MagicMock()
+                 patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR") as MockExecutor:
                 resp = client.post(f"/api/jobs/{job_id}/restart")
 
         assert resp.status_code == 202
@@ -160,9 +180,8 @@ class TestRestartEndpointRetrysMigration:
         assert data["job_type"] == "migration"
         assert data["mode"] == "retry_failed"
         assert data["failed_issues"] == 1
-        # Thread should have been spawned to run retry
-        MockThread.assert_called_once()
-        MockThread.return_value.start.assert_called_once()
+        # Retry should have been submitted to the job pool
+        MockExecutor.submit.assert_called_once()
 
     def test_restart_migration_with_no_failures_still_succeeds(self, tmp_path):
         """If all issues are completed, restart still works (no-op migration)."""
@@ -173,8 +192,7 @@ class TestRestartEndpointRetrysMigration:
         from crew_studio.llamaindex_web_app import app
         with app.test_client() as client:
             with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
-                 patch("crew_studio.llamaindex_web_app.threading.Thread") as MockThread:
-                MockThread.return_value.start = MagicMock()
+                 patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR") as MockExecutor:
                 resp = client.post(f"/api/jobs/{job_id}/restart")
 
         assert resp.status_code == 202
@@ -63,6 +63,20 @@ class TestGetJobsCount:
         assert db_with_jobs.get_jobs_count() == 24
 
 
+class TestCountActiveJobs:
+    """count_active_jobs counts only queued and running jobs."""
+
+    def test_counts_queued_and_running(self, db_with_jobs):
+        db_with_jobs.update_job("job-001", {"status": "running"})
+        db_with_jobs.update_job("job-002", {"status": "completed"})
+        db_with_jobs.update_job("job-003", {"status": "failed"})
+        assert db_with_jobs.count_active_jobs() == 23
+
+    def test_empty_db(self, db):
+        database, _ = db
+        assert database.count_active_jobs() == 0
+
+
 class TestGetJobsPaginated:
     """get_jobs_paginated returns correct slices ordered by created_at DESC."""
 
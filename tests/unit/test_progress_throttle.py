@@ -0,0 +1,70 @@
+"""
+Progress throttling: percent-only ticks inside PROGRESS_MIN_INTERVAL are
+held back, and the latest one is still written once the window closes.
+"""
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(root))
+sys.path.insert(0, str(root / "agent"))
+sys.path.insert(0, str(root / "agent" / "src"))
+
+from crew_studio.job_database import JobDatabase
+
+
+def _running_job(tmp_path):
+    job_db = JobDatabase(tmp_path / "test.db")
+    job_id = str(uuid.uuid4())
+    job_db.create_job(job_id, "Build a REST API", f"/tmp/ws/job-{job_id}")
+    job_db.mark_started(job_id)
+    return job_db, job_id
+
+
+class _RecordingTimer:
+    """Stands in for threading.Timer; the test fires it by hand."""
+    started = []
+
+    def __init__(self, interval, function):
+        self.interval = interval
+        self.function = function
+        self.daemon = False
+
+    def start(self):
+        self.started.append(self)
+
+
+class TestThrottledProgressCallback:
+    def test_latest_held_back_tick_is_flushed(self, tmp_path):
+        from crew_studio.llamaindex_web_app import _throttled_progress_callback
+
+        job_db, job_id = _running_job(tmp_path)
+        _RecordingTimer.started = []
+        with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
+             patch("crew_studio.llamaindex_web_app.PROGRESS_MIN_INTERVAL", 60), \
+             patch("crew_studio.llamaindex_web_app.threading.Timer", _RecordingTimer):
+            callback = _throttled_progress_callback(job_id)
+            callback("development", 10)
+            callback("development", 20)
+            callback("development", 30)
+            assert job_db.get_job(job_id)["progress"] == 10
+            # One timer covers every tick held back in the same window
+            assert len(_RecordingTimer.started) == 1
+            _RecordingTimer.started[0].function()
+
+        assert job_db.get_job(job_id)["progress"] == 30
+
+    def test_messages_are_written_immediately(self, tmp_path):
+        from crew_studio.llamaindex_web_app import _throttled_progress_callback
+
+        job_db, job_id = _running_job(tmp_path)
+        with patch("crew_studio.llamaindex_web_app.job_db", job_db):
+            callback = _throttled_progress_callback(job_id)
+            callback("development", 10)
+            callback("development", 15, "Writing app.py")
+
+        job = job_db.get_job(job_id)
+        assert job["progress"] == 15
+        assert job["last_message"][-1]["message"] == "Writing app.py"
@@ -111,16 +111,14 @@ class TestRestartEndpoint:
         from crew_studio.llamaindex_web_app import app
         with app.test_client() as client:
             with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
-                 patch("crew_studio.llamaindex_web_app.threading.Thread") as MockThread:
-                MockThread.return_value.start = MagicMock()
+                 patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR") as MockExecutor:
                 resp = client.post(f"/api/jobs/{job_id}/restart")
 
         assert resp.status_code == 202
         data = resp.get_json()
         assert data["job_type"] == "build"
-        # Thread should have been started with run_job_async
-        MockThread.assert_called_once()
-        MockThread.return_value.start.assert_called_once()
+        # run_job_async should have been submitted to the job pool
+        MockExecutor.submit.assert_called_once()
 
     def test_restart_migration_job_clears_stale_and_starts(self, tmp_path):
         """Failed MTA job: clear stale migration_issues, start migration."""
@@ -131,8 +129,7 @@ class TestRestartEndpoint:
         from crew_studio.llamaindex_web_app import app
         with app.test_client() as client:
             with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
-                 patch("crew_studio.llamaindex_web_app.threading.Thread") as MockThread:
-                MockThread.return_value.start = MagicMock()
+                 patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR") as MockExecutor:
                 resp = client.post(f"/api/jobs/{job_id}/restart")
 
         assert resp.status_code == 202
@@ -149,8 +146,7 @@ class TestRestartEndpoint:
         from crew_studio.llamaindex_web_app import app
         with app.test_client() as client:
             with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
-                 patch("crew_studio.llamaindex_web_app.threading.Thread") as MockThread:
-                MockThread.return_value.start = MagicMock()
+                 patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR") as MockExecutor:
                 resp = client.post(f"/api/jobs/{job_id}/restart")
 
         assert resp.status_code == 202
@@ -178,8 +174,7 @@ class TestRestartEndpoint:
         from crew_studio.llamaindex_web_app import app
         with app.test_client() as client:
             with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
-                 patch("crew_studio.llamaindex_web_app.threading.Thread") as MockThread:
-                MockThread.return_value.start = MagicMock()
+                 patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR") as MockExecutor:
                 resp = client.post(f"/api/jobs/{job_id}/restart")
 
         assert resp.status_code == 202
@@ -202,8 +197,7 @@ class TestRestartEndpoint:
         from crew_studio.llamaindex_web_app import app
         with app.test_client() as client:
             with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
-                 patch("crew_studio.llamaindex_web_app.threading.Thread") as MockThread:
-                MockThread.return_value.start = MagicMock()
+                 patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR") as MockExecutor:
                 resp = client.post(
                     f"/api/jobs/{job_id}/restart",
                     json={"resume": True},
@@ -211,10 +205,10 @@ class TestRestartEndpoint:
                 )
         assert resp.status_code == 202
         assert resp.get_json().get("job_type") == "build"
-        MockThread.assert_called_once()
-        # Thread target is run_job_async; args/kwargs should include resume=True
-        call_kw = MockThread.call_args[1]
-        assert call_kw.get("kwargs", {}).get("resume") is True
+        MockExecutor.submit.assert_called_once()
+        # Submitted target is run_job_async; kwargs should include resume=True
+        call_kw = MockExecutor.submit.call_args[1]
+        assert call_kw.get("resume") is True
 
     def test_restart_build_job_without_resume_uses_resume_false(self, tmp_path):
         """POST /restart without body or resume=false does not pass resume (full restart)."""
@@ -224,12 +218,11 @@ class TestRestartEndpoint:
         from crew_studio.llamaindex_web_app import app
         with app.test_client() as client:
             with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
-                 patch("crew_studio.llamaindex_web_app.threading.Thread") as MockThread:
-                MockThread.return_value.start = MagicMock()
+                 patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR") as MockExecutor:
                 resp = client.post(f"/api/jobs/{job_id}/restart")
         assert resp.status_code == 202
-        call_kw = MockThread.call_args[1]
-        assert call_kw.get("kwargs", {}).get("resume") is not True
+        call_kw = MockExecutor.submit.call_args[1]
+        assert call_kw.get("resume") is not True
 
     def test_restart_partially_completed_defaults_to_retry_failed(self, tmp_path):
         """partially_completed build jobs default to mode=retry_failed."""
@@ -239,16 +232,15 @@ class TestRestartEndpoint:
         from crew_studio.llamaindex_web_app import app
         with app.test_client() as client:
             with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
-                 patch("crew_studio.llamaindex_web_app.threading.Thread") as MockThread:
-                MockThread.return_value.start = MagicMock()
+                 patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR") as MockExecutor:
                 resp = client.post(f"/api/jobs/{job_id}/restart")
 
         assert resp.status_code == 202
         data = resp.get_json()
         assert data["job_type"] == "build"
         assert data["mode"] == "retry_failed"
-        call_kw = MockThread.call_args[1]
-        assert call_kw.get("kwargs", {}).get("retry_failed") is True
+        call_kw = MockExecutor.submit.call_args[1]
+        assert call_kw.get("retry_failed") is True
 
     def test_restart_build_with_explicit_retry_failed_mode(self, tmp_path):
         """POST /restart with mode=retry_failed passes retry_failed=True."""
@@ -258,8 +250,7 @@ class TestRestartEndpoint:
         from crew_studio.llamaindex_web_app import app
         with app.test_client() as client:
             with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
-                 patch("crew_studio.llamaindex_web_app.threading.Thread") as MockThread:
-                MockThread.return_value.start = MagicMock()
+                 patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR") as MockExecutor:
                 resp = client.post(
                     f"/api/jobs/{job_id}/restart",
                     json={"mode": "retry_failed"},
@@ -268,9 +259,9 @@ class TestRestartEndpoint:
 
         assert resp.status_code == 202
         assert resp.get_json()["mode"] == "retry_failed"
-        call_kw = MockThread.call_args[1]
-        assert call_kw.get("kwargs", {}).get("retry_failed") is True
-        assert call_kw.get("kwargs", {}).get("resume") is not True
+        call_kw = MockExecutor.submit.call_args[1]
+        assert call_kw.get("retry_failed") is True
+        assert call_kw.get("resume") is not True
 
     def test_restart_build_resume_not_retry_failed(self, tmp_path):
         """Explicit resume=true keeps mode=resume (not retry_failed)."""
@@ -280,8 +271,7 @@ class TestRestartEndpoint:
         from crew_studio.llamaindex_web_app import app
         with app.test_client() as client:
             with patch("crew_studio.llamaindex_web_app.job_db", job_db), \
-                 patch("crew_studio.llamaindex_web_app.threading.Thread") as MockThread:
-                MockThread.return_value.start = MagicMock()
+                 patch("crew_studio.llamaindex_web_app._JOB_EXECUTOR") as MockExecutor:
                 resp = client.post(
                     f"/api/jobs/{job_id}/restart",
                     json={"resume": True},
@@ -290,9 +280,9 @@ class TestRestartEndpoint:
 
         assert resp.status_code == 202
         assert resp.get_json()["mode"] == "resume"
-        call_kw = MockThread.call_args[1]
-        assert call_kw.get("kwargs", {}).get("resume") is True
-        assert call_kw.get("kwargs", {}).get("retry_failed") is not True
+        call_kw = MockExecutor.submit.call_args[1]
+        assert call_kw.get("resume") is True
+        assert call_kw.get("retry_failed") is not True
 
 
 # ═══════════════════════════════════════════════════════════════════════════════